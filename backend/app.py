@@ -1,19 +1,49 @@
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
 from flask_cors import CORS
+from flask_compress import Compress
+from werkzeug.http import generate_etag
 import logging
+import logging.config
+from functools import lru_cache
 from config import Config
-from routes import campaigns_bp, contributions_bp, auth_bp, payments_bp
+from json_provider import OrjsonProvider
+from routes import get_campaigns_bp, get_contributions_bp, get_auth_bp, get_payments_bp
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure logging: one root handler; module loggers propagate to it.
+# Log calls pass arguments separately so messages are only formatted
+# for records that are actually emitted.
+logging.config.dictConfig({
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'default': {
+            'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        }
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'default'
+        }
+    },
+    'root': {
+        'level': 'INFO',
+        'handlers': ['console']
+    }
+})
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=1)
 def create_app():
-    """Application factory"""
+    """
+    Application factory
+
+    The app is built once per process; repeat calls (serverless handlers,
+    test fixtures) get the same instance. Call create_app.cache_clear()
+    to force a fresh build.
+    """
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
 
     # Load configuration
     app.config.from_object(Config)
@@ -22,45 +52,88 @@ def create_app():
         Config.validate()
         logger.info("Configuration validated successfully")
     except ValueError as e:
-        logger.error(f"Configuration error: {str(e)}")
+        logger.error("Configuration error: %s", e)
         raise
 
-    # Enable CORS
-    CORS(app, origins=Config.CORS_ORIGINS)
+    # Enable CORS (browsers cache preflight responses for CORS_MAX_AGE seconds)
+    CORS(
+        app,
+        origins=Config.CORS_ORIGINS,
+        max_age=Config.CORS_MAX_AGE,
+        expose_headers=['X-Poll-Next-Ms'],
+        supports_credentials=False
+    )
+
+    # Compress JSON responses (settings come from Config.COMPRESS_*)
+    Compress(app)
+
+    # Answer preflight requests before any blueprint or auth code runs.
+    # Flask-CORS still decorates the response in its after_request hook.
+    @app.before_request
+    def short_circuit_preflight():
+        if request.method == 'OPTIONS':
+            return app.make_default_options_response()
+
+    # Register blueprints (route modules are imported lazily here)
+    app.register_blueprint(get_campaigns_bp())
+    app.register_blueprint(get_contributions_bp())
+    app.register_blueprint(get_auth_bp())
+    app.register_blueprint(get_payments_bp())
+
+    # One LNbits event stream per host confirms payments as they land
+    # (services are imported only when enabled, like the route modules)
+    if Config.LNBITS_SSE_ENABLED:
+        from services import get_invoice_subscriber
+        get_invoice_subscriber().start()
+
+    # With Redis, each process also picks up confirmations a dead worker
+    # acknowledged but never wrote
+    if Config.CONFIRMATION_BATCH_INTERVAL > 0 and Config.REDIS_URL:
+        from services import get_payment_queue
+        get_payment_queue().start()
+
+    # The /health and / payloads never change, so they are serialized once
+    # and revalidated by ETag instead of being rebuilt on every request
+    health_body = app.json.dumps({
+        'status': 'healthy',
+        'service': 'CrowdPay API',
+        'version': '2.0.0',
+        'payment_provider': 'LNbits'
+    }).encode()
+    root_body = app.json.dumps({
+        'message': 'Welcome to CrowdPay API',
+        'version': '2.0.0',
+        'payment_provider': 'LNbits (Lightning Network)',
+        'endpoints': {
+            'campaigns': '/api/campaigns',
+            'contributions': '/api/contributions',
+            'invoice_create': '/api/invoice/create',
+            'invoice_status': '/api/invoice/status/<payment_hash>',
+            'wallet_balance': '/api/wallet/balance',
+            'webhook': '/api/webhooks/lnbits',
+            'health': '/health'
+        }
+    }).encode()
+    health_etag = generate_etag(health_body)
+    root_etag = generate_etag(root_body)
 
-    # Register blueprints
-    app.register_blueprint(campaigns_bp)
-    app.register_blueprint(contributions_bp)
-    app.register_blueprint(auth_bp)
-    app.register_blueprint(payments_bp)
+    def static_json(body, etag):
+        """Serve a pre-serialized JSON body, answering 304 on a matching ETag"""
+        response = app.response_class(body, mimetype='application/json')
+        response.set_etag(etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = 60
+        return response.make_conditional(request)
 
     # Health check endpoint
     @app.route('/health', methods=['GET'])
     def health_check():
-        return jsonify({
-            'status': 'healthy',
-            'service': 'CrowdPay API',
-            'version': '2.0.0',
-            'payment_provider': 'LNbits'
-        }), 200
+        return static_json(health_body, health_etag)
 
     # Root endpoint
     @app.route('/', methods=['GET'])
     def root():
-        return jsonify({
-            'message': 'Welcome to CrowdPay API',
-            'version': '2.0.0',
-            'payment_provider': 'LNbits (Lightning Network)',
-            'endpoints': {
-                'campaigns': '/api/campaigns',
-                'contributions': '/api/contributions',
-                'invoice_create': '/api/invoice/create',
-                'invoice_status': '/api/invoice/status/<payment_hash>',
-                'wallet_balance': '/api/wallet/balance',
-                'webhook': '/api/webhooks/lnbits',
-                'health': '/health'
-            }
-        }), 200
+        return static_json(root_body, root_etag)
 
     # Error handlers
     @app.errorhandler(404)
@@ -69,12 +142,12 @@ def create_app():
 
     @app.errorhandler(500)
     def internal_error(error):
-        logger.error(f"Internal server error: {str(error)}")
+        logger.error("Internal server error: %s", error)
         return jsonify({'error': 'Internal server error'}), 500
 
     @app.errorhandler(Exception)
     def handle_exception(error):
-        logger.error(f"Unhandled exception: {str(error)}")
+        logger.error("Unhandled exception: %s", error)
         return jsonify({'error': 'An unexpected error occurred'}), 500
 
     logger.info("CrowdPay API initialized successfully with LNbits integration")
@@ -1,7 +1,32 @@
 import os
+import re
 from dotenv import load_dotenv
 
-load_dotenv()
+# Load backend/.env by explicit path; this skips find_dotenv()'s stack
+# inspection and parent-directory walk on every process start
+load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env'))
+
+
+def parse_cors_origins(value: str) -> list:
+    """
+    Parse the comma-separated CORS_ORIGINS setting
+
+    Entries containing a '*' wildcard (e.g. https://*.vercel.app) are compiled
+    once into anchored regexes that match a single host label; plain origins
+    and a bare '*' are passed to Flask-CORS unchanged.
+    """
+    origins = []
+    for origin in value.split(','):
+        origin = origin.strip()
+        if not origin:
+            continue
+        if origin != '*' and '*' in origin:
+            pattern = '[^./]+'.join(re.escape(part) for part in origin.split('*'))
+            origins.append(re.compile(f'^{pattern}$', re.IGNORECASE))
+        else:
+            origins.append(origin)
+    return origins
+
 
 class Config:
     """Application configuration"""
@@ -13,6 +38,11 @@ class Config:
     # Supabase
     SUPABASE_URL = os.getenv('SUPABASE_URL')
     SUPABASE_KEY = os.getenv('SUPABASE_KEY')
+    # Optional: verify access tokens locally instead of asking Supabase Auth.
+    # JWT secret for HS256 projects, JWKS URL for asymmetric signing keys
+    # (https://<project>.supabase.co/auth/v1/.well-known/jwks.json)
+    SUPABASE_JWT_SECRET = os.getenv('SUPABASE_JWT_SECRET', '')
+    SUPABASE_JWKS_URL = os.getenv('SUPABASE_JWKS_URL', '')
 
     # LNbits Configuration
     # LNbits is an open-source Lightning wallet/accounts system
@@ -23,19 +53,51 @@ class Config:
     LNBITS_INVOICE_KEY = os.getenv('LNBITS_INVOICE_KEY')  # Read-only, safe for invoices
     LNBITS_WEBHOOK_URL = os.getenv('LNBITS_WEBHOOK_URL', '')  # Optional webhook for payment notifications
 
-    # Polling Configuration
+    # Payment event stream: one SSE connection per host to LNbits confirms
+    # payments; status checks only query LNbits for invoices pending longer
+    # than the SLA
+    LNBITS_SSE_ENABLED = os.getenv('LNBITS_SSE_ENABLED', 'True').lower() == 'true'
+    LNBITS_STREAM_SLA = int(os.getenv('LNBITS_STREAM_SLA', '30'))  # seconds
+
+    # Polling Configuration (used when the event stream is disabled)
     POLLING_INTERVAL = int(os.getenv('POLLING_INTERVAL', '30'))  # seconds
     POLLING_TIMEOUT = int(os.getenv('POLLING_TIMEOUT', '3600'))  # 1 hour
 
     # Platform Fee Configuration (percentage)
     PLATFORM_FEE_PERCENT = float(os.getenv('PLATFORM_FEE_PERCENT', '2.5'))
+    PLATFORM_FEE_BP = round(PLATFORM_FEE_PERCENT * 100)  # basis points, for integer sats math
+
+    # Webhook/event-stream payment confirmations are queued and written in
+    # batches every interval (seconds); 0 confirms each one in the request
+    CONFIRMATION_BATCH_INTERVAL = float(os.getenv('CONFIRMATION_BATCH_INTERVAL', '0.05'))
+    CONFIRMATION_BATCH_SIZE = int(os.getenv('CONFIRMATION_BATCH_SIZE', '200'))
+
+    # Redis (optional): shares auth and campaign caches across workers
+    REDIS_URL = os.getenv('REDIS_URL', '')
+    REDIS_MAX_CONNECTIONS = int(os.getenv('REDIS_MAX_CONNECTIONS', '50'))
+    USER_CACHE_TTL = 60  # seconds
+    CAMPAIGN_CACHE_TTL = 30  # seconds
 
     # CORS
-    CORS_ORIGINS = os.getenv('CORS_ORIGINS', '*').split(',')
+    CORS_ORIGINS = parse_cors_origins(os.getenv('CORS_ORIGINS', '*'))
+    CORS_MAX_AGE = int(os.getenv('CORS_MAX_AGE', '86400'))  # Preflight cache lifetime (seconds)
+
+    # Response compression (Flask-Compress); JSON only, small bodies skipped
+    COMPRESS_MIMETYPES = ['application/json']
+    COMPRESS_ALGORITHM = ['br', 'gzip']
+    COMPRESS_BR_LEVEL = 4
+    COMPRESS_LEVEL = 6
+    COMPRESS_MIN_SIZE = 512
+
+    # Set once validate() succeeds; the environment is read only at import
+    _validated = False
 
     @classmethod
     def validate(cls):
-        """Validate required configuration"""
+        """Validate required configuration (checked once per process)"""
+        if cls._validated:
+            return True
+
         required = [
             'SUPABASE_URL',
             'SUPABASE_KEY',
@@ -48,4 +110,5 @@ class Config:
         if missing:
             raise ValueError(f"Missing required configuration: {', '.join(missing)}")
 
+        cls._validated = True
         return True
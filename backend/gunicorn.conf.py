@@ -0,0 +1,17 @@
+"""
+Gunicorn settings for production
+
+Request handlers spend almost all of their time waiting on Supabase and
+LNbits, so gevent workers are used: gunicorn monkey-patches sockets and
+threads before loading the app, and each worker keeps many requests in
+flight instead of one per thread.
+"""
+
+import multiprocessing
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+worker_class = 'gevent'
+# One event loop per core: a gevent worker already multiplexes its requests
+workers = int(os.getenv('GUNICORN_WORKERS', str(multiprocessing.cpu_count())))
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', '1000'))
@@ -0,0 +1,40 @@
+"""
+orjson-backed JSON provider for Flask
+
+Serializes jsonify() responses and parses request bodies with orjson.
+datetime values are emitted as ISO 8601 strings; anything orjson cannot
+handle natively (Decimal, Markup, ...) falls back to Flask's default
+conversion.
+"""
+
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+# Supabase rows and helper dicts may carry non-string keys
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider using orjson for dumps/loads"""
+
+    def dumps(self, obj, **kwargs) -> str:
+        option = ORJSON_OPTIONS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """Build a JSON response straight from orjson bytes"""
+        obj = self._prepare_response_obj(args, kwargs)
+        option = ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE
+
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=option),
+            mimetype=self.mimetype
+        )
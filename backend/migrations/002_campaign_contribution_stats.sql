@@ -0,0 +1,14 @@
+-- Migration: Campaign contribution stats RPC
+-- Description: Counts a campaign's contributions in Postgres so the API
+--              no longer downloads every contribution row to count them
+
+CREATE OR REPLACE FUNCTION campaign_contribution_stats(cid UUID)
+RETURNS TABLE(total INT, paid INT) AS $$
+    SELECT
+        COUNT(*)::INT,
+        (COUNT(*) FILTER (WHERE payment_status = 'paid'))::INT
+    FROM contributions
+    WHERE campaign_id = cid;
+$$ LANGUAGE sql STABLE;
+
+GRANT EXECUTE ON FUNCTION campaign_contribution_stats(UUID) TO authenticated, anon;
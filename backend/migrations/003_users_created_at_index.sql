@@ -0,0 +1,7 @@
+-- Migration: Index users by signup time
+-- Description: Supports keyset pagination on GET /api/auth/users, which
+--              orders by (created_at DESC, id DESC) and resumes after the
+--              cursor row; id breaks ties between equal timestamps
+
+DROP INDEX IF EXISTS idx_users_created_at;
+CREATE INDEX IF NOT EXISTS idx_users_created_id ON users(created_at DESC, id DESC);
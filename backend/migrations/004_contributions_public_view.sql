@@ -0,0 +1,29 @@
+-- Migration: Public contributions view
+-- Description: Redacts anonymous contributors' name and email in the
+--              projection so the API never receives them for public listings
+
+CREATE OR REPLACE VIEW contributions_public
+WITH (security_invoker = true) AS
+SELECT
+    id,
+    campaign_id,
+    CASE WHEN is_anonymous THEN 'Anonymous' ELSE contributor_name END AS contributor_name,
+    CASE WHEN is_anonymous THEN NULL ELSE contributor_email END AS contributor_email,
+    amount,
+    currency,
+    payment_status,
+    lnbits_payment_hash,
+    lnbits_payment_request,
+    lnbits_checking_id,
+    bitnob_payment_id,
+    bitnob_payment_request,
+    bitnob_payment_hash,
+    bitnob_reference,
+    transaction_id,
+    message,
+    is_anonymous,
+    created_at,
+    paid_at
+FROM contributions;
+
+GRANT SELECT ON contributions_public TO authenticated, anon;
@@ -0,0 +1,21 @@
+-- Migration: Campaigns with contribution stats view
+-- Description: Joins per-campaign contribution counts onto campaigns so the
+--              listing returns them in one query instead of one per campaign
+
+CREATE OR REPLACE VIEW campaigns_with_stats
+WITH (security_invoker = true) AS
+SELECT
+    c.*,
+    COALESCE(ct.total, 0)::INT AS total_contributions,
+    COALESCE(ct.paid, 0)::INT AS paid_contributions
+FROM campaigns c
+LEFT JOIN (
+    SELECT
+        campaign_id,
+        COUNT(*) AS total,
+        COUNT(*) FILTER (WHERE payment_status = 'paid') AS paid
+    FROM contributions
+    GROUP BY campaign_id
+) ct ON ct.campaign_id = c.id;
+
+GRANT SELECT ON campaigns_with_stats TO authenticated, anon;
@@ -0,0 +1,9 @@
+-- Migration: Unique email and username on users
+-- Description: Lets signup rely on the database to reject duplicates
+--              (unique_violation 23505) instead of a racy SELECT-then-INSERT
+
+-- IMPORTANT: Resolve any existing duplicate emails/usernames before running
+
+ALTER TABLE users
+    ADD CONSTRAINT users_email_uk UNIQUE (email),
+    ADD CONSTRAINT users_username_uk UNIQUE (username);
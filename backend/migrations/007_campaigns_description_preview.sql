@@ -0,0 +1,22 @@
+-- Migration: Description preview on campaigns_with_stats
+-- Description: Adds a 200-character description_preview so the campaign
+--              listing can skip the full description TEXT column
+
+CREATE OR REPLACE VIEW campaigns_with_stats
+WITH (security_invoker = true) AS
+SELECT
+    c.*,
+    COALESCE(ct.total, 0)::INT AS total_contributions,
+    COALESCE(ct.paid, 0)::INT AS paid_contributions,
+    LEFT(c.description, 200) AS description_preview
+FROM campaigns c
+LEFT JOIN (
+    SELECT
+        campaign_id,
+        COUNT(*) AS total,
+        COUNT(*) FILTER (WHERE payment_status = 'paid') AS paid
+    FROM contributions
+    GROUP BY campaign_id
+) ct ON ct.campaign_id = c.id;
+
+GRANT SELECT ON campaigns_with_stats TO authenticated, anon;
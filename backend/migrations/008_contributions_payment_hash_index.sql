@@ -0,0 +1,15 @@
+-- Migration: Index payment hash lookups and pending contributions
+-- Description: Webhook, event stream and polling code find contributions by
+--              bitnob_payment_hash (still the lookup column during the LNbits
+--              transition), which had no index; the partial index serves the
+--              pending-invoice reconciliation queries
+
+-- CONCURRENTLY avoids locking writes on a live table; run each statement
+-- on its own (not inside a transaction block)
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_contributions_bitnob_payment_hash
+ON contributions(bitnob_payment_hash);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_contributions_pending
+ON contributions(payment_status)
+WHERE payment_status = 'pending';
@@ -0,0 +1,13 @@
+-- Migration: Atomic campaign credit
+-- Description: Adds a paid contribution to campaigns.current_amount in one
+--              statement, replacing the read-then-write from the API that
+--              could lose updates when payments were confirmed concurrently
+
+CREATE OR REPLACE FUNCTION credit_campaign(cid UUID, delta NUMERIC)
+RETURNS NUMERIC AS $$
+    UPDATE campaigns
+    SET current_amount = current_amount + delta,
+        updated_at = NOW()
+    WHERE id = cid
+    RETURNING current_amount;
+$$ LANGUAGE sql;
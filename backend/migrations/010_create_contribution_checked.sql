@@ -0,0 +1,44 @@
+-- Migration: Checked contribution insert
+-- Description: Inserts a contribution only while its campaign exists and is
+--              active, checking status in the same call as the insert, so a
+--              campaign closed after the API's cached check doesn't take new
+--              contributions. Raises P0002 for a missing campaign and P0001
+--              for an inactive one.
+
+CREATE OR REPLACE FUNCTION create_contribution_checked(cid UUID, payload JSONB)
+RETURNS VOID AS $$
+DECLARE
+    campaign_status TEXT;
+BEGIN
+    -- No row lock: FOR SHARE needs UPDATE rights on campaigns, which
+    -- contributors (anon) don't have under RLS
+    SELECT status INTO campaign_status FROM campaigns WHERE id = cid;
+
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Campaign not found' USING ERRCODE = 'P0002';
+    END IF;
+
+    IF campaign_status <> 'active' THEN
+        RAISE EXCEPTION 'Campaign is not active' USING ERRCODE = 'P0001';
+    END IF;
+
+    INSERT INTO contributions (
+        id, campaign_id, contributor_name, contributor_email, amount, currency,
+        payment_status, lnbits_payment_hash, lnbits_payment_request,
+        lnbits_checking_id, bitnob_payment_id, bitnob_payment_request,
+        bitnob_payment_hash, bitnob_reference, transaction_id, message,
+        is_anonymous, created_at
+    )
+    SELECT
+        COALESCE(r.id, uuid_generate_v4()), cid, r.contributor_name,
+        r.contributor_email, r.amount, COALESCE(r.currency, 'SATS'),
+        COALESCE(r.payment_status, 'pending'), r.lnbits_payment_hash,
+        r.lnbits_payment_request, r.lnbits_checking_id, r.bitnob_payment_id,
+        r.bitnob_payment_request, r.bitnob_payment_hash, r.bitnob_reference,
+        r.transaction_id, r.message, COALESCE(r.is_anonymous, FALSE),
+        COALESCE(r.created_at, NOW())
+    FROM jsonb_populate_record(NULL::contributions, payload) AS r;
+END;
+$$ LANGUAGE plpgsql;
+
+GRANT EXECUTE ON FUNCTION create_contribution_checked(UUID, JSONB) TO authenticated, anon;
@@ -0,0 +1,41 @@
+-- Migration: Batch payment confirmation
+-- Description: Marks the contributions for a batch of paid invoices as paid
+--              and credits their campaigns in one statement, so a
+--              contribution can't end up paid but never credited.
+--              Contributions already paid are skipped, so repeated
+--              notifications are harmless; only the rows changed by this
+--              call are credited and returned.
+--              payments: [{"payment_hash": "...", "preimage": "..."}, ...]
+--              fee_bp: platform fee in basis points, taken from each
+--              contribution (rounded down to a whole sat) before crediting
+--              Also drops credit_campaign (migration 009), which this
+--              function replaces.
+
+DROP FUNCTION IF EXISTS mark_contributions_paid(JSONB);
+DROP FUNCTION IF EXISTS credit_campaign(UUID, NUMERIC);
+
+CREATE OR REPLACE FUNCTION mark_contributions_paid(payments JSONB, fee_bp INT)
+RETURNS TABLE(id UUID, campaign_id UUID, amount NUMERIC) AS $$
+    WITH paid AS (
+        UPDATE contributions AS c
+        SET payment_status = 'paid',
+            paid_at = NOW(),
+            transaction_id = COALESCE(p.preimage, c.transaction_id)
+        FROM jsonb_to_recordset(payments) AS p(payment_hash TEXT, preimage TEXT)
+        WHERE c.bitnob_payment_hash = p.payment_hash
+          AND c.payment_status <> 'paid'
+        RETURNING c.id, c.campaign_id, c.amount
+    ), credited AS (
+        UPDATE campaigns AS cp
+        SET current_amount = cp.current_amount + s.total,
+            updated_at = NOW()
+        FROM (
+            SELECT paid.campaign_id,
+                   SUM(paid.amount - FLOOR(paid.amount * fee_bp / 10000)) AS total
+            FROM paid
+            GROUP BY paid.campaign_id
+        ) AS s
+        WHERE cp.id = s.campaign_id
+    )
+    SELECT paid.id, paid.campaign_id, paid.amount FROM paid;
+$$ LANGUAGE sql;
@@ -0,0 +1,10 @@
+-- Migration: Index contribution listings for keyset pagination
+-- Description: GET /api/contributions pages newest first by (created_at, id),
+--              usually within one campaign; the composite index serves both
+--              the ordering and the cursor filter without a sort
+
+-- CONCURRENTLY avoids locking writes on a live table; run it on its own
+-- (not inside a transaction block)
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_contributions_campaign_created
+ON contributions(campaign_id, created_at DESC, id DESC);
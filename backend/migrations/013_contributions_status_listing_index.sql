@@ -0,0 +1,12 @@
+-- Migration: Index contribution listings filtered by payment status
+-- Description: GET /api/contributions?campaign_id=...&payment_status=paid
+--              (the campaign page's supporter list) matches the leading
+--              equality columns and reads rows already in (created_at, id)
+--              keyset order, so neither a sort nor a status filter over the
+--              whole campaign is needed
+
+-- CONCURRENTLY avoids locking writes on a live table; run it on its own
+-- (not inside a transaction block)
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_contributions_campaign_status_created
+ON contributions(campaign_id, payment_status, created_at DESC, id DESC);
@@ -1,6 +1,13 @@
 from datetime import datetime
-from typing import Optional, Dict, Any
-from pydantic import BaseModel, Field, validator
+from typing import Optional, Dict, Any, Tuple
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
+
+_ALLOWED_STATUSES = frozenset(('active', 'completed', 'cancelled', 'expired'))
+_ALLOWED_CURRENCIES = frozenset(('KSH', 'USD', 'BTC', 'SATS'))
+_STATUS_ERROR = f"Status must be one of {sorted(_ALLOWED_STATUSES)}"
+_CURRENCY_ERROR = f"Currency must be one of {sorted(_ALLOWED_CURRENCIES)}"
+_DATETIME_FIELDS = ('end_date', 'created_at', 'updated_at')
+_parse_datetime = TypeAdapter(Optional[datetime]).validate_python
 
 
 class Campaign(BaseModel):
@@ -19,60 +26,82 @@ class Campaign(BaseModel):
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     
-    @validator('status')
+    @field_validator('status')
+    @classmethod
     def validate_status(cls, v):
-        allowed_statuses = ['active', 'completed', 'cancelled', 'expired']
-        if v not in allowed_statuses:
-            raise ValueError(f"Status must be one of {allowed_statuses}")
+        if v not in _ALLOWED_STATUSES:
+            raise ValueError(_STATUS_ERROR)
         return v
     
-    @validator('currency')
+    @field_validator('currency')
+    @classmethod
     def validate_currency(cls, v):
-        allowed_currencies = ['KSH', 'USD', 'BTC', 'SATS']
-        if v not in allowed_currencies:
-            raise ValueError(f"Currency must be one of {allowed_currencies}")
+        if v not in _ALLOWED_CURRENCIES:
+            raise ValueError(_CURRENCY_ERROR)
         return v
     
-    @validator('current_amount')
-    def validate_current_amount(cls, v, values):
+    @field_validator('current_amount')
+    @classmethod
+    def validate_current_amount(cls, v):
         if v < 0:
             raise ValueError("Current amount cannot be negative")
         return v
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert model to dictionary for database operations"""
-        data = self.dict(exclude_none=True)
-        
-        # Convert datetime objects to ISO format strings
-        if self.end_date:
-            data['end_date'] = self.end_date.isoformat()
-        if self.created_at:
-            data['created_at'] = self.created_at.isoformat()
-        if self.updated_at:
-            data['updated_at'] = self.updated_at.isoformat()
-            
-        return data
+        # mode='json' emits datetimes as ISO format strings
+        return self.model_dump(exclude_none=True, mode='json')
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Campaign':
         """Create Campaign instance from dictionary"""
         return cls(**data)
     
+    @classmethod
+    def from_db_row(cls, row: Dict[str, Any]) -> 'Campaign':
+        """
+        Create Campaign instance from a trusted database row
+
+        Skips the validator chain (the row already satisfied the table
+        constraints); only timestamps are parsed. Use from_dict() for
+        client-supplied data.
+        """
+        data = dict(row)
+        for field in _DATETIME_FIELDS:
+            if isinstance(data.get(field), str):
+                data[field] = _parse_datetime(data[field])
+
+        return cls.model_construct(**data)
+    
+    @classmethod
+    def validate_update(cls, data: Dict[str, Any]) -> None:
+        """
+        Validate a partial update field by field, without needing the
+        stored row to build a full model. Raises ValidationError.
+        """
+        instance = cls.model_construct()
+        for field, value in data.items():
+            cls.__pydantic_validator__.validate_assignment(instance, field, value)
+    
+    def progress(self) -> Tuple[float, bool, float]:
+        """
+        Compute progress percentage, goal-reached flag and remaining amount
+        in one pass over target_amount/current_amount
+        """
+        target = self.target_amount
+        current = self.current_amount
+        if current >= target:
+            return (100.0 if target > 0 else 0.0), True, 0.0
+        return (current / target) * 100, False, target - current
+
     def progress_percentage(self) -> float:
         """Calculate campaign progress percentage"""
-        if self.target_amount <= 0:
-            return 0.0
-        return min((self.current_amount / self.target_amount) * 100, 100.0)
+        return self.progress()[0]
     
     def is_goal_reached(self) -> bool:
         """Check if campaign has reached its goal"""
-        return self.current_amount >= self.target_amount
+        return self.progress()[1]
     
     def remaining_amount(self) -> float:
         """Calculate remaining amount to reach goal"""
-        return max(self.target_amount - self.current_amount, 0.0)
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat() if v else None
-        }
+        return self.progress()[2]
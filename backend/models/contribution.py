@@ -1,6 +1,25 @@
 from datetime import datetime
 from typing import Optional, Dict, Any
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
+
+_ALLOWED_PAYMENT_STATUSES = frozenset(('pending', 'paid', 'failed', 'expired', 'cancelled'))
+# Lightning-only: we only accept SATS
+# Keep BTC for display purposes (will be converted to SATS)
+_ALLOWED_CURRENCIES = frozenset(('SATS', 'BTC'))
+_PAYMENT_STATUS_ERROR = f"Payment status must be one of {sorted(_ALLOWED_PAYMENT_STATUSES)}"
+_CURRENCY_ERROR = f"Currency must be one of {sorted(_ALLOWED_CURRENCIES)}"
+
+# New field names -> legacy bitnob_* database columns (until migration)
+_LEGACY_COLUMNS = {
+    'lnbits_payment_hash': 'bitnob_payment_hash',
+    'lnbits_payment_request': 'bitnob_payment_request',
+    'lnbits_checking_id': 'bitnob_payment_id',
+}
+# Fields tracked on the model that have no database column
+_NON_DB_FIELDS = frozenset(('platform_fee', 'creator_amount'))
+# Timestamp columns come back from PostgREST as ISO strings
+_DATETIME_FIELDS = ('created_at', 'paid_at')
+_parse_datetime = TypeAdapter(Optional[datetime]).validate_python
 
 
 class Contribution(BaseModel):
@@ -45,53 +64,50 @@ class Contribution(BaseModel):
     platform_fee: Optional[float] = None  # Fee amount in satoshis
     creator_amount: Optional[float] = None  # Amount after fee deduction
 
-    @validator('payment_status')
+    @field_validator('payment_status')
+    @classmethod
     def validate_payment_status(cls, v):
-        allowed_statuses = ['pending', 'paid', 'failed', 'expired', 'cancelled']
-        if v not in allowed_statuses:
-            raise ValueError(f"Payment status must be one of {allowed_statuses}")
+        if v not in _ALLOWED_PAYMENT_STATUSES:
+            raise ValueError(_PAYMENT_STATUS_ERROR)
         return v
 
-    @validator('currency')
+    @field_validator('currency')
+    @classmethod
     def validate_currency(cls, v):
-        # Lightning-only: we only accept SATS
-        # Keep BTC for display purposes (will be converted to SATS)
-        allowed_currencies = ['SATS', 'BTC']
-        if v not in allowed_currencies:
-            raise ValueError(f"Currency must be one of {allowed_currencies}")
+        if v not in _ALLOWED_CURRENCIES:
+            raise ValueError(_CURRENCY_ERROR)
         return v
 
-    @validator('amount')
+    @field_validator('amount')
+    @classmethod
     def validate_amount(cls, v):
         if v <= 0:
             raise ValueError("Amount must be greater than 0")
         return v
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert model to dictionary for database operations"""
-        data = self.dict(exclude_none=True)
-
-        # Convert datetime objects to ISO format strings
-        if self.created_at:
-            data['created_at'] = self.created_at.isoformat()
-        if self.paid_at:
-            data['paid_at'] = self.paid_at.isoformat()
-
-        # Map new field names to legacy database columns (until migration)
-        # This ensures compatibility with existing database schema
-        if self.lnbits_payment_hash and 'bitnob_payment_hash' not in data:
-            data['bitnob_payment_hash'] = self.lnbits_payment_hash
-        if self.lnbits_payment_request and 'bitnob_payment_request' not in data:
-            data['bitnob_payment_request'] = self.lnbits_payment_request
-        if self.lnbits_checking_id and 'bitnob_payment_id' not in data:
-            data['bitnob_payment_id'] = self.lnbits_checking_id
-
-        # Remove new field names that don't exist in DB yet
-        data.pop('lnbits_payment_hash', None)
-        data.pop('lnbits_payment_request', None)
-        data.pop('lnbits_checking_id', None)
-        data.pop('platform_fee', None)
-        data.pop('creator_amount', None)
+    def to_dict(self, dumped: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Convert model to dictionary for database operations
+
+        Args:
+            dumped: This model's model_dump(mode='json'), if the caller already
+                    has one; it is reused instead of walking the model again
+        """
+        if dumped is None:
+            # mode='json' emits datetimes as ISO format strings
+            data = self.model_dump(exclude_none=True, exclude=_NON_DB_FIELDS, mode='json')
+        else:
+            data = {
+                k: v for k, v in dumped.items()
+                if v is not None and k not in _NON_DB_FIELDS
+            }
+
+        # Map new field names to legacy database columns in one pass,
+        # keeping an explicitly set legacy value if there is one
+        for field, column in _LEGACY_COLUMNS.items():
+            value = data.pop(field, None)
+            if value is not None:
+                data.setdefault(column, value)
 
         return data
 
@@ -99,14 +115,30 @@ class Contribution(BaseModel):
     def from_dict(cls, data: Dict[str, Any]) -> 'Contribution':
         """Create Contribution instance from dictionary"""
         # Map legacy field names to new ones for internal use
-        if 'bitnob_payment_hash' in data:
-            data['lnbits_payment_hash'] = data.get('bitnob_payment_hash')
-        if 'bitnob_payment_request' in data:
-            data['lnbits_payment_request'] = data.get('bitnob_payment_request')
-        if 'bitnob_payment_id' in data:
-            data['lnbits_checking_id'] = data.get('bitnob_payment_id')
+        for field, column in _LEGACY_COLUMNS.items():
+            if column in data:
+                data[field] = data[column]
 
-        return cls(**data)
+        return cls.model_validate(data)
+
+    @classmethod
+    def from_db_row(cls, row: Dict[str, Any]) -> 'Contribution':
+        """
+        Create Contribution instance from a trusted database row
+
+        Skips the validator chain (the row already satisfied the table
+        constraints); only legacy names are mapped and timestamps parsed.
+        Use from_dict() for client-supplied data.
+        """
+        data = dict(row)
+        for field, column in _LEGACY_COLUMNS.items():
+            if column in data:
+                data[field] = data[column]
+        for field in _DATETIME_FIELDS:
+            if isinstance(data.get(field), str):
+                data[field] = _parse_datetime(data[field])
+
+        return cls.model_construct(**data)
 
     def is_paid(self) -> bool:
         """Check if contribution has been paid"""
@@ -129,8 +161,3 @@ class Contribution(BaseModel):
     def get_payment_request(self) -> Optional[str]:
         """Get payment request/invoice (supports both new and legacy field names)"""
         return self.lnbits_payment_request or self.bitnob_payment_request
-
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat() if v else None
-        }
@@ -6,8 +6,34 @@ contributions_bp = Blueprint('contributions', __name__, url_prefix='/api/contrib
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 payments_bp = Blueprint('payments', __name__, url_prefix='/api')
 
-# Import routes to register them
-from . import campaigns, contributions, auth, payments
 
+# Route modules pull in Supabase, LNbits and pydantic at import time, so they
+# are only imported when the app factory asks for their blueprint.
+def get_campaigns_bp() -> Blueprint:
+    """Import campaign routes and return their blueprint"""
+    from . import campaigns  # noqa: F401
+    return campaigns_bp
 
-__all__ = ['campaigns_bp', 'contributions_bp', 'auth_bp', 'payments_bp']
+
+def get_contributions_bp() -> Blueprint:
+    """Import contribution routes and return their blueprint"""
+    from . import contributions  # noqa: F401
+    return contributions_bp
+
+
+def get_auth_bp() -> Blueprint:
+    """Import auth routes and return their blueprint"""
+    from . import auth  # noqa: F401
+    return auth_bp
+
+
+def get_payments_bp() -> Blueprint:
+    """Import payment routes and return their blueprint"""
+    from . import payments  # noqa: F401
+    return payments_bp
+
+
+__all__ = [
+    'campaigns_bp', 'contributions_bp', 'auth_bp', 'payments_bp',
+    'get_campaigns_bp', 'get_contributions_bp', 'get_auth_bp', 'get_payments_bp'
+]
@@ -1,63 +1,182 @@
 from flask import Blueprint, request, jsonify
+import base64
+import binascii
 import logging
+import orjson
 import re
-from services import get_supabase_client
+import threading
+import uuid
+from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from typing import Annotated, Tuple
+from supabase import AuthApiError, PostgrestAPIError
+from config import Config
+from services import get_supabase_client, cache_get, cache_set, cache_delete
+from services.auth import forget_token, get_auth_service, token_key
 from . import auth_bp
-from pydantic import BaseModel, EmailStr, validator
+from pydantic import AfterValidator, BaseModel, ValidationInfo, field_validator, validate_email
 
 logger = logging.getLogger(__name__)
 supabase = get_supabase_client()
 
+# Runs independent Supabase round trips concurrently within a request
+executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='auth-io')
+
+# Supabase Auth error codes for an email that is already registered
+DUPLICATE_EMAIL_CODES = frozenset(('email_exists', 'user_already_exists'))
+
+# Postgres SQLSTATE raised when a UNIQUE constraint is violated
+UNIQUE_VIOLATION = '23505'
+
+# Usernames: ASCII letters, digits, hyphens and underscores
+USERNAME_PATTERN = re.compile(r'[A-Za-z0-9_-]+')
+
+# Characters that satisfy the password "special character" rule
+PASSWORD_SPECIAL_CHARS = frozenset('!@#$%^&*(),.?":{}|<>_-+=[]\\/~`')
+
+# Page size bounds for the /users listing
+USERS_PAGE_DEFAULT = 50
+USERS_PAGE_MAX = 100
+
+# Short-lived token -> users row cache for /me, keyed like the token -> user
+# cache in services.auth. Only read once that cache or AuthService has
+# verified the token; Redis (when configured) backs it so all workers share hits
+user_cache = TTLCache(maxsize=10_000, ttl=Config.USER_CACHE_TTL)
+user_cache_lock = threading.Lock()
+
+
+def get_cached_user(token: str):
+    """Return the cached users row for a verified token, or None"""
+    key = token_key(token)
+    with user_cache_lock:
+        user_data = user_cache.get(key)
+    if user_data is not None:
+        return user_data
+
+    cached = cache_get(f'user:{key.hex()}')
+    if cached is None:
+        return None
+    user_data = orjson.loads(cached)
+    with user_cache_lock:
+        user_cache[key] = user_data
+    return user_data
+
+
+def cache_user(token: str, user_data: dict):
+    """Remember the users row for a verified token until the TTL expires"""
+    key = token_key(token)
+    with user_cache_lock:
+        user_cache[key] = user_data
+    cache_set(f'user:{key.hex()}', orjson.dumps(user_data), Config.USER_CACHE_TTL)
+
+
+def evict_cached_user(token: str):
+    """Drop a token from the caches (e.g. on signout)"""
+    key = token_key(token)
+    with user_cache_lock:
+        user_cache.pop(key, None)
+    cache_delete(f'user:{key.hex()}')
+    forget_token(token)
+
+
+@lru_cache(maxsize=4096)
+def normalize_email(value: str) -> str:
+    """
+    Validate email syntax (no DNS lookups) and return the normalized address
+
+    Same checks, display-name handling and errors as EmailStr. Only valid
+    addresses are memoized; invalid ones raise and are re-checked each time.
+    """
+    return validate_email(value)[1]
+
+
+# Drop-in for EmailStr that memoizes results for repeat sign ins
+Email = Annotated[str, AfterValidator(normalize_email)]
+
 
 class SignUpRequest(BaseModel):
     username: str
-    email: EmailStr
+    email: Email
     password: str
     password_confirmation: str
 
-    @validator('username')
+    @field_validator('username')
+    @classmethod
     def validate_username(cls, v):
         if len(v) < 3:
             raise ValueError('Username must be at least 3 characters')
-        if not v.replace('_', '').replace('-', '').isalnum():
+        if not USERNAME_PATTERN.fullmatch(v):
             raise ValueError('Username can only contain letters, numbers, hyphens and underscores')
         return v
 
-    @validator('password')
+    @field_validator('password')
+    @classmethod
     def validate_password(cls, v):
         if len(v) < 8:
             raise ValueError('Password must be at least 8 characters long')
         
-        # Check for uppercase letter
-        if not re.search(r'[A-Z]', v):
+        # Classify every character in one pass instead of one regex scan per rule
+        has_upper = has_lower = has_digit = has_special = False
+        for ch in v:
+            if 'A' <= ch <= 'Z':
+                has_upper = True
+            elif 'a' <= ch <= 'z':
+                has_lower = True
+            elif ch.isdecimal():
+                has_digit = True
+            elif ch in PASSWORD_SPECIAL_CHARS:
+                has_special = True
+            else:
+                continue
+            # Stop scanning once every rule is satisfied
+            if has_upper and has_lower and has_digit and has_special:
+                break
+
+        if not has_upper:
             raise ValueError('Password must contain at least one uppercase letter')
-        
-        # Check for lowercase letter
-        if not re.search(r'[a-z]', v):
+        if not has_lower:
             raise ValueError('Password must contain at least one lowercase letter')
-        
-        # Check for digit
-        if not re.search(r'\d', v):
+        if not has_digit:
             raise ValueError('Password must contain at least one number')
-        
-        # Check for special character
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>_\-+=\[\]\\\/~`]', v):
+        if not has_special:
             raise ValueError('Password must contain at least one special character (!@#$%^&*...)')
         
         return v
 
-    @validator('password_confirmation')
-    def passwords_match(cls, v, values):
-        if 'password' in values and v != values['password']:
+    @field_validator('password_confirmation')
+    @classmethod
+    def passwords_match(cls, v, info: ValidationInfo):
+        if 'password' in info.data and v != info.data['password']:
             raise ValueError('Passwords do not match')
         return v
 
 
 class SignInRequest(BaseModel):
-    email: EmailStr
+    email: Email
     password: str
 
 
+def encode_cursor(created_at: str, user_id: str) -> str:
+    """Encode the last row's (created_at, id) as an opaque pagination cursor"""
+    return base64.urlsafe_b64encode(f"{created_at},{user_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Decode a pagination cursor, raising ValueError if it is malformed"""
+    try:
+        created_at, _, user_id = base64.urlsafe_b64decode(
+            cursor.encode()
+        ).decode().partition(',')
+    except (binascii.Error, UnicodeError) as e:
+        raise ValueError('Invalid cursor') from e
+    # Reject anything but a timestamp and a UUID before they reach the filter
+    datetime.fromisoformat(created_at)
+    uuid.UUID(user_id)
+    return created_at, user_id
+
+
 def session_to_dict(session):
     """Convert Supabase Session object to JSON-serializable dict"""
     if session is None:
@@ -74,11 +193,9 @@ def session_to_dict(session):
 def signup():
     """Register a new user using Supabase Auth with duplicate check"""
     try:
-        data = request.get_json()
-        
-        # Validate input data
+        # Validate the raw body directly (parsed and checked in pydantic-core)
         try:
-            signup_data = SignUpRequest(**data)
+            signup_data = SignUpRequest.model_validate_json(request.get_data())
         except ValueError as ve:
             # Return validation errors with specific field information
             error_msg = str(ve)
@@ -99,30 +216,38 @@ def signup():
                 'field': field
             }), 400
 
-        # Check if email already exists in users table
-        existing_email = supabase.table("users").select("*").eq("email", signup_data.email).execute()
-        if existing_email.data:
+        # Check the username first, so a taken one never creates an Auth
+        # account (with the anon key it couldn't be removed again)
+        taken = supabase.table("users").select(
+            "id", count="exact", head=True
+        ).eq("username", signup_data.username).execute()
+        if taken.count:
             return jsonify({
-                'error': 'Email already exists',
-                'field': 'email'
+                'error': 'Username already taken',
+                'field': 'username'
             }), 409
 
-        # Check if username already exists
+        # Create user in Supabase Auth
         try:
-            existing_username = supabase.table("users").select("*").eq("username", signup_data.username).execute()
-            if existing_username.data:
+            res = supabase.auth.sign_up({
+                "email": signup_data.email,
+                "password": signup_data.password
+            })
+        except AuthApiError as auth_error:
+            if auth_error.code in DUPLICATE_EMAIL_CODES:
                 return jsonify({
-                    'error': 'Username already taken',
-                    'field': 'username'
+                    'error': 'Email already exists',
+                    'field': 'email'
                 }), 409
-        except Exception as username_error:
-            logger.warning(f"Username check skipped: {str(username_error)}")
+            raise
 
-        # Create user in Supabase Auth
-        res = supabase.auth.sign_up({
-            "email": signup_data.email,
-            "password": signup_data.password
-        })
+        # With email confirmation enabled, Supabase answers a duplicate sign up
+        # with an obfuscated user that has no identities
+        if res.user is not None and res.user.identities == []:
+            return jsonify({
+                'error': 'Email already exists',
+                'field': 'email'
+            }), 409
 
         if res.user is None:
             return jsonify({
@@ -136,7 +261,24 @@ def signup():
             "email": signup_data.email,
             "username": signup_data.username
         }
-        supabase.table("users").insert(user_data).execute()
+        # UNIQUE(email) and UNIQUE(username) on users catch a concurrent
+        # sign up that claimed the username after the check above
+        try:
+            supabase.table("users").insert(user_data).execute()
+        except PostgrestAPIError as insert_error:
+            if insert_error.code != UNIQUE_VIOLATION:
+                raise
+
+            logger.warning("Sign up lost a race for users row of auth user %s", res.user.id)
+            if 'username' in f"{insert_error.message} {insert_error.details}":
+                return jsonify({
+                    'error': 'Username already taken',
+                    'field': 'username'
+                }), 409
+            return jsonify({
+                'error': 'Email already exists',
+                'field': 'email'
+            }), 409
 
         # Check if email confirmation is required
         message = "User registered successfully"
@@ -151,7 +293,7 @@ def signup():
         }), 201
 
     except Exception as e:
-        logger.error(f"Signup error: {str(e)}")
+        logger.error("Signup error: %s", e)
         return jsonify({
             'error': 'Registration failed. Please try again.',
             'field': 'general'
@@ -162,8 +304,13 @@ def signup():
 def signin():
     """Sign in an existing user using Supabase Auth"""
     try:
-        data = request.get_json()
-        signin_data = SignInRequest(**data)
+        signin_data = SignInRequest.model_validate_json(request.get_data())
+
+        # Fetch extra user info from users table while authenticating;
+        # it is only returned once the credentials check out
+        profile = executor.submit(
+            lambda: supabase.table("users").select("*").eq("email", signin_data.email).limit(1).execute()
+        )
 
         res = supabase.auth.sign_in_with_password({
             "email": signin_data.email,
@@ -173,9 +320,16 @@ def signin():
         if res.user is None:
             return jsonify({'error': 'Invalid credentials'}), 401
 
-        # Fetch extra user info from users table
-        user_resp = supabase.table("users").select("*").eq("id", res.user.id).single().execute()
-        user_data = user_resp.data if user_resp.data else {"id": res.user.id, "email": res.user.email}
+        try:
+            rows = profile.result().data
+        except Exception as profile_error:
+            logger.warning("Profile lookup failed: %s", profile_error)
+            rows = None
+
+        if rows and rows[0].get("id") == res.user.id:
+            user_data = rows[0]
+        else:
+            user_data = {"id": res.user.id, "email": res.user.email}
 
         return jsonify({
             "message": "Signed in successfully",
@@ -184,7 +338,7 @@ def signin():
         }), 200
 
     except Exception as e:
-        logger.error(f"Signin error: {str(e)}")
+        logger.error("Signin error: %s", e)
         return jsonify({'error': 'Invalid credentials'}), 401
 
 
@@ -196,12 +350,13 @@ def signout():
 
         if auth_header and auth_header.startswith('Bearer '):
             token = auth_header.split(' ')[1]
+            evict_cached_user(token)
             supabase.auth.sign_out(token)
 
         return jsonify({'message': 'Signed out successfully'}), 200
 
     except Exception as e:
-        logger.error(f"Signout error: {str(e)}")
+        logger.error("Signout error: %s", e)
         return jsonify({'message': 'Signed out'}), 200
 
 
@@ -215,19 +370,22 @@ def get_current_user():
             return jsonify({'error': 'No authorization token'}), 401
 
         token = auth_header.split(' ')[1]
-        user_resp = supabase.auth.get_user(token)
+        user = get_auth_service().get_user_from_token(token)
 
-        if not user_resp or not user_resp.user:
+        if not user:
             return jsonify({'error': 'Invalid token'}), 401
 
-        # Fetch extra user info from users table
-        user_data_resp = supabase.table("users").select("*").eq("id", user_resp.user.id).single().execute()
-        user_data = user_data_resp.data if user_data_resp.data else {"id": user_resp.user.id, "email": user_resp.user.email}
+        user_data = get_cached_user(token)
+        if user_data is None:
+            # Fetch extra user info from users table
+            user_data_resp = supabase.table("users").select("*").eq("id", user['id']).single().execute()
+            user_data = user_data_resp.data if user_data_resp.data else {"id": user['id'], "email": user['email']}
+            cache_user(token, user_data)
 
         return jsonify({'user': user_data}), 200
 
     except Exception as e:
-        logger.error(f"Get user error: {str(e)}")
+        logger.error("Get user error: %s", e)
         return jsonify({'error': 'Failed to get user'}), 500
 
 
@@ -249,7 +407,7 @@ def refresh():
         }), 200
 
     except Exception as e:
-        logger.error(f"Refresh error: {str(e)}")
+        logger.error("Refresh error: %s", e)
         return jsonify({'error': 'Failed to refresh token'}), 401
 
 
@@ -263,19 +421,43 @@ def get_all_users():
             return jsonify({'error': 'No authorization token'}), 401
 
         token = auth_header.split(' ')[1]
-        user_resp = supabase.auth.get_user(token)
 
-        if not user_resp or not user_resp.user:
+        if get_auth_service().get_user_from_token(token) is None:
             return jsonify({'error': 'Invalid token'}), 401
 
-        # Fetch all users from users table
-        users_resp = supabase.table("users").select("id, email, username, created_at").execute()
+        limit = request.args.get('limit', USERS_PAGE_DEFAULT, type=int)
+        limit = max(1, min(limit, USERS_PAGE_MAX))
+        cursor = request.args.get('cursor')
+
+        # Keyset pagination: newest first by (created_at, id), resuming after
+        # the cursor row; id breaks ties between users created at the same time
+        query = supabase.table("users").select("id, email, username, created_at")
+        if cursor:
+            try:
+                created_at, last_id = decode_cursor(cursor)
+            except ValueError:
+                return jsonify({'error': 'Invalid cursor'}), 400
+            query = query.or_(
+                f'created_at.lt."{created_at}",'
+                f'and(created_at.eq."{created_at}",id.lt.{last_id})'
+            )
+
+        users_resp = query.order("created_at", desc=True).order(
+            "id", desc=True
+        ).limit(limit).execute()
+        users = users_resp.data
+        next_cursor = (
+            encode_cursor(users[-1]['created_at'], users[-1]['id'])
+            if len(users) == limit else None
+        )
         
         return jsonify({
-            'users': users_resp.data,
-            'count': len(users_resp.data)
+            'users': users,
+            'count': len(users),
+            'limit': limit,
+            'next_cursor': next_cursor
         }), 200
 
     except Exception as e:
-        logger.error(f"Get all users error: {str(e)}")
+        logger.error("Get all users error: %s", e)
         return jsonify({'error': 'Failed to fetch users'}), 500
\ No newline at end of file
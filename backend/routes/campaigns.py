@@ -1,15 +1,33 @@
 from flask import request, jsonify
-from datetime import datetime
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
 import logging
+import orjson
 from . import campaigns_bp
+from .conditional import compute_etag, not_modified, with_etag
+from .contributions import LISTING_COLUMNS as CONTRIBUTION_COLUMNS
 from models import Campaign
-from services import get_supabase_client
+from config import Config
+from services import (
+    get_supabase_client, cache_get, cache_set, campaign_cache_key,
+    invalidate_campaign
+)
 from services.auth import optional_auth, require_auth
 from pydantic import ValidationError
 
 logger = logging.getLogger(__name__)
 supabase = get_supabase_client()
 
+# Runs independent Supabase round trips concurrently within a request
+executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='campaigns-io')
+
+# Listing columns: a short description preview instead of the full TEXT
+LISTING_COLUMNS = (
+    'id, creator_id, title, description_preview, target_amount, current_amount, '
+    'currency, status, end_date, created_at, updated_at, total_contributions, '
+    'paid_contributions'
+)
+
 
 @campaigns_bp.route('', methods=['POST'])
 @require_auth
@@ -27,8 +45,7 @@ def create_campaign():
         
         # Validate and create campaign model
         campaign = Campaign(**data)
-        campaign.created_at = datetime.now()
-        campaign.updated_at = datetime.now()
+        campaign.created_at = campaign.updated_at = datetime.now(timezone.utc)
         
         # Insert into database
         campaign_data = campaign.to_dict()
@@ -39,20 +56,20 @@ def create_campaign():
         if not response.data:
             return jsonify({'error': 'Failed to create campaign'}), 500
         
-        created_campaign = Campaign.from_dict(response.data[0])
+        created_campaign = Campaign.from_db_row(response.data[0])
         
-        logger.info(f"Campaign created: {created_campaign.id}")
+        logger.info("Campaign created: %s", created_campaign.id)
         
         return jsonify({
             'message': 'Campaign created successfully',
-            'campaign': created_campaign.dict()
+            'campaign': created_campaign.model_dump()
         }), 201
         
     except ValidationError as e:
-        logger.error(f"Validation error: {str(e)}")
+        logger.error("Validation error: %s", e)
         return jsonify({'error': 'Validation error', 'details': e.errors()}), 400
     except Exception as e:
-        logger.error(f"Error creating campaign: {str(e)}")
+        logger.error("Error creating campaign: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 @campaigns_bp.route('', methods=['GET'])
@@ -66,8 +83,8 @@ def get_campaigns():
         limit = request.args.get('limit', 50, type=int)
         offset = request.args.get('offset', 0, type=int)
         
-        # Build query
-        query = supabase.table('campaigns').select('*')
+        # Build query; the view carries per-campaign contribution counts
+        query = supabase.table('campaigns_with_stats').select(LISTING_COLUMNS)
         
         if status:
             query = query.eq('status', status)
@@ -80,17 +97,28 @@ def get_campaigns():
             offset, offset + limit - 1
         ).execute()
         
-        campaigns = [Campaign.from_dict(c).dict() for c in response.data]
-        
-        return jsonify({
+        # Rows come straight from PostgREST in the campaign shape already
+        campaigns = response.data
+
+        # updated_at is bumped by trigger on every write, so ids, timestamps
+        # and contribution counts identify the page without serializing it
+        etag = compute_etag(*(
+            f"{c['id']}:{c['updated_at']}:{c['total_contributions']}:{c['paid_contributions']}"
+            for c in campaigns
+        ))
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
+        
+        return with_etag(jsonify({
             'campaigns': campaigns,
             'count': len(campaigns),
             'offset': offset,
             'limit': limit
-        }), 200
+        }), etag), 200
         
     except Exception as e:
-        logger.error(f"Error fetching campaigns: {str(e)}")
+        logger.error("Error fetching campaigns: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 @campaigns_bp.route('/<campaign_id>', methods=['GET'])
@@ -98,38 +126,67 @@ def get_campaigns():
 def get_campaign(campaign_id):
     """Get a specific campaign by ID"""
     try:
-        response = supabase.table('campaigns').select('*').eq(
-            'id', campaign_id
-        ).single().execute()
+        # Shared cache hit: skip both Supabase reads
+        cached = cache_get(campaign_cache_key(campaign_id))
+        if cached is not None:
+            entry = orjson.loads(cached)
+            not_modified_response = not_modified(entry['etag'])
+            if not_modified_response is not None:
+                return not_modified_response
+            return with_etag(jsonify(entry['payload']), entry['etag']), 200
+
+        # Fetch the campaign and its contribution statistics concurrently
+        campaign_future = executor.submit(
+            supabase.table('campaigns').select('*').eq(
+                'id', campaign_id
+            ).single().execute
+        )
+        stats_future = executor.submit(
+            supabase.rpc(
+                'campaign_contribution_stats', {'cid': campaign_id}
+            ).execute
+        )
+
+        response = campaign_future.result()
         
         if not response.data:
             return jsonify({'error': 'Campaign not found'}), 404
         
-        campaign = Campaign.from_dict(response.data)
-        
-        # Get contribution statistics
-        contrib_response = supabase.table('contributions').select(
-            'id, amount, payment_status'
-        ).eq('campaign_id', campaign_id).execute()
+        campaign = Campaign.from_db_row(response.data)
+        stats_rows = stats_future.result().data
+        stats = stats_rows[0] if stats_rows else {}
+        total_contributions = stats.get('total', 0)
+        paid_contributions = stats.get('paid', 0)
         
-        total_contributions = len(contrib_response.data)
-        paid_contributions = sum(
-            1 for c in contrib_response.data if c['payment_status'] == 'paid'
+        etag = compute_etag(
+            campaign.id, campaign.updated_at, total_contributions, paid_contributions
         )
-        
-        return jsonify({
-            'campaign': campaign.dict(),
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
+
+        progress_percentage, is_goal_reached, remaining_amount = campaign.progress()
+
+        payload = {
+            'campaign': campaign.model_dump(),
             'statistics': {
-                'progress_percentage': campaign.progress_percentage(),
-                'remaining_amount': campaign.remaining_amount(),
+                'progress_percentage': progress_percentage,
+                'remaining_amount': remaining_amount,
                 'total_contributions': total_contributions,
                 'paid_contributions': paid_contributions,
-                'is_goal_reached': campaign.is_goal_reached()
+                'is_goal_reached': is_goal_reached
             }
-        }), 200
+        }
+        cache_set(
+            campaign_cache_key(campaign_id),
+            orjson.dumps({'etag': etag, 'payload': payload}),
+            Config.CAMPAIGN_CACHE_TTL
+        )
+
+        return with_etag(jsonify(payload), etag), 200
         
     except Exception as e:
-        logger.error(f"Error fetching campaign: {str(e)}")
+        logger.error("Error fetching campaign: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 @campaigns_bp.route('/<campaign_id>', methods=['PUT'])
@@ -142,17 +199,6 @@ def update_campaign(campaign_id):
         if not data:
             return jsonify({'error': 'No data provided'}), 400
         
-        # Check if campaign exists
-        existing = supabase.table('campaigns').select('*').eq(
-            'id', campaign_id
-        ).single().execute()
-        if not existing.data:
-            return jsonify({'error': 'Campaign not found'}), 404
-        
-        # Verify ownership
-        if existing.data['creator_id'] != request.user['id']:
-            return jsonify({'error': 'Unauthorized'}), 403
-        
         # Update only allowed fields
         allowed_fields = [
             'title', 'description', 'target_amount', 'status', 'end_date'
@@ -164,30 +210,41 @@ def update_campaign(campaign_id):
         if not update_data:
             return jsonify({'error': 'No valid fields to update'}), 400
         
-        update_data['updated_at'] = datetime.now().isoformat()
+        update_data['updated_at'] = datetime.now(timezone.utc).isoformat()
 
-        # Merge with existing data to validate
-        campaign_data = {**existing.data, **update_data}
-        campaign = Campaign(**campaign_data)    
+        # Validate the changed fields on their own so the stored row
+        # doesn't have to be fetched first
+        Campaign.validate_update(update_data)
         
-        # Update in database
-        response =supabase.table('campaigns').update(
+        # Update in database; the creator filter doubles as the ownership
+        # check and the returned representation as the existence check
+        response = supabase.table('campaigns').update(
             update_data
-        ).eq('id', campaign_id).execute()
+        ).eq('id', campaign_id).eq('creator_id', request.user['id']).execute()
+
+        if not response.data:
+            # Only the failure path pays for a second round trip
+            existing = supabase.table('campaigns').select(
+                'id', count='exact', head=True
+            ).eq('id', campaign_id).execute()
+            if not existing.count:
+                return jsonify({'error': 'Campaign not found'}), 404
+            return jsonify({'error': 'Unauthorized'}), 403
 
-        updated_campaign = Campaign.from_dict(response.data[0])  
-        logger.info(f"Campaign updated: {campaign_id}") 
+        invalidate_campaign(campaign_id)
+        updated_campaign = Campaign.from_db_row(response.data[0])  
+        logger.info("Campaign updated: %s", campaign_id) 
 
         return jsonify({
             'message': 'Campaign updated successfully',
-            'campaign': updated_campaign.dict()
+            'campaign': updated_campaign.model_dump()
         }), 200
         
     except ValidationError as e:
-        logger.error(f"Validation error: {str(e)}")
+        logger.error("Validation error: %s", e)
         return jsonify({'error': 'Validation error', 'details': e.errors()}), 400
     except Exception as e:
-        logger.error(f"Error updating campaign: {str(e)}")
+        logger.error("Error updating campaign: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 @campaigns_bp.route('/<campaign_id>', methods=['DELETE'])
@@ -195,26 +252,22 @@ def update_campaign(campaign_id):
 def delete_campaign(campaign_id):
     """Delete a campaign (soft delete by changing status)"""
     try:
-        # Check if campaign exists
-        existing = supabase.table('campaigns').select('*').eq(
-            'id', campaign_id
-        ).single().execute()
-        
-        if not existing.data:
-            return jsonify({'error': 'Campaign not found'}), 404
-        
-        # Soft delete by updating status
-        supabase.table('campaigns').update({
+        # Soft delete by updating status; no returned row means no campaign
+        response = supabase.table('campaigns').update({
             'status': 'cancelled',
-            'updated_at': datetime.now().isoformat()
+            'updated_at': datetime.now(timezone.utc).isoformat()
         }).eq('id', campaign_id).execute()
         
-        logger.info(f"Campaign deleted (cancelled): {campaign_id}")
+        if not response.data:
+            return jsonify({'error': 'Campaign not found'}), 404
+        
+        invalidate_campaign(campaign_id)
+        logger.info("Campaign deleted (cancelled): %s", campaign_id)
         
         return jsonify({'message': 'Campaign cancelled successfully'}), 200
         
     except Exception as e:
-        logger.error(f"Error deleting campaign: {str(e)}")
+        logger.error("Error deleting campaign: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 @campaigns_bp.route('/<campaign_id>/contributions', methods=['GET'])
@@ -222,33 +275,27 @@ def delete_campaign(campaign_id):
 def get_campaign_contributions(campaign_id):
     """Get all contributions for a campaign"""
     try:
-        # Check if campaign exists
-        campaign_exists = supabase.table('campaigns').select('id').eq(
-            'id', campaign_id
-        ).execute()
+        # Check if campaign exists (HEAD request: count header, no body)
+        campaign_exists = supabase.table('campaigns').select(
+            'id', count='exact', head=True
+        ).eq('id', campaign_id).execute()
         
-        if not campaign_exists.data:
+        if not campaign_exists.count:
             return jsonify({'error': 'Campaign not found'}), 404
         
-        # Get contributions
-        response = supabase.table('contributions').select('*').eq(
-            'campaign_id', campaign_id
-        ).order('created_at', desc=True).execute()
+        # Get contributions; the view already redacts anonymous contributors
+        response = supabase.table('contributions_public').select(
+            CONTRIBUTION_COLUMNS
+        ).eq('campaign_id', campaign_id).order('created_at', desc=True).execute()
         
         contributions = response.data
         
-        # Filter anonymous contributor info
-        for contrib in contributions:
-            if contrib.get('is_anonymous'):
-                contrib['contributor_name'] = 'Anonymous'
-                contrib['contributor_email'] = None
-        
         return jsonify({
             'contributions': contributions,
             'count': len(contributions)
         }), 200
         
     except Exception as e:
-        logger.error(f"Error fetching contributions: {str(e)}")
+        logger.error("Error fetching contributions: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
     
\ No newline at end of file
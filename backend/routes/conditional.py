@@ -0,0 +1,25 @@
+"""Conditional GET helpers (weak ETags and 304 responses) shared by routes"""
+
+import hashlib
+from flask import current_app, request
+
+
+def compute_etag(*parts) -> str:
+    """Hash the values a response depends on into an ETag"""
+    raw = '|'.join(str(part) for part in parts).encode()
+    return hashlib.md5(raw, usedforsecurity=False).hexdigest()
+
+
+def not_modified(etag: str):
+    """Return a 304 response if the client already holds this ETag, else None"""
+    if request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+        response.set_etag(etag, weak=True)
+        return response
+    return None
+
+
+def with_etag(response, etag: str):
+    """Attach a weak ETag (left untouched by response compression)"""
+    response.set_etag(etag, weak=True)
+    return response
@@ -12,31 +12,189 @@ Payment Flow:
 2. Frontend displays QR code with BOLT11 invoice
 3. User pays with Lightning wallet
 4. GET /api/contributions/<id>/status - Frontend polls for payment status
-5. POST /api/webhooks/lnbits - LNbits notifies on payment (alternative to polling)
+5. LNbits payment event stream (or POST /api/webhooks/lnbits) confirms payment
 """
 
 from flask import request, jsonify
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation
+from typing import Optional, Tuple
+import base64
+import binascii
 import logging
+import orjson
+import os
+import threading
 import uuid
 
+from cachetools import TTLCache
+
 from services.auth import optional_auth, require_auth
 from . import contributions_bp
+from .conditional import compute_etag, not_modified, with_etag
 from models import Contribution
-from services import get_supabase_client, LNbitsService, InvoicePollingService
-from services.lnbits import LNbitsAPIError
+from services import (
+    get_supabase_client, get_lnbits_service, get_polling_service, mark_contribution_paid,
+    get_campaign_summary, forget_campaign, get_payment_queue,
+    get_paid_contribution, remember_contribution, claim_once, cache_delete
+)
+from services.lnbits import LNbitsAPIError, btc_to_sats
 from pydantic import ValidationError
+from supabase import PostgrestAPIError
 from config import Config
 
 logger = logging.getLogger(__name__)
 supabase = get_supabase_client()
-lnbits_service = LNbitsService()
-polling_service = InvoicePollingService()
+lnbits_service = get_lnbits_service()
+polling_service = get_polling_service()
+
+# Overlaps the campaign lookup with request validation
+executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='contributions-io')
+
+# LNbits status checks run here so status reads never wait on them
+refresh_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='status-refresh')
+
+# Lightning invoices issued for contributions expire after this (seconds)
+INVOICE_EXPIRY = 3600
+
+# LNbits retries webhooks; a payment's deliveries are deduplicated for this
+# long (seconds) when Redis is configured
+WEBHOOK_DEDUPE_TTL = 3600
+
+# Ask LNbits about a pending contribution at most once per this many seconds
+STATUS_REFRESH_INTERVAL = 3
+_recent_refreshes = TTLCache(maxsize=10_000, ttl=STATUS_REFRESH_INTERVAL)
+_refresh_lock = threading.Lock()
+
+# Status polling hint: start at POLL_HINT_MIN_MS and double every
+# POLL_HINT_STEP seconds of invoice age, up to POLL_HINT_MAX_MS
+POLL_HINT_MIN_MS = 500
+POLL_HINT_MAX_MS = 30_000
+POLL_HINT_STEP = 30
+
+# create_contribution_checked errors: campaign missing / not active
+CAMPAIGN_NOT_FOUND = 'P0002'
+CAMPAIGN_NOT_ACTIVE = 'P0001'
+
+# Columns the status endpoint needs
+STATUS_COLUMNS = (
+    'id, payment_status, lnbits_payment_hash, bitnob_payment_hash, created_at, paid_at'
+)
+
+# Listing columns: invoice strings, provider ids and preimages are left to
+# the single-contribution endpoints
+LISTING_COLUMNS = (
+    'id, campaign_id, contributor_name, contributor_email, amount, currency, '
+    'payment_status, message, is_anonymous, created_at, paid_at'
+)
+
+
+def uuid7(now: datetime) -> uuid.UUID:
+    """
+    Time-ordered UUID (RFC 9562 version 7): 48-bit millisecond timestamp
+    followed by random bits, so new ids sort after older ones
+    """
+    unix_ms = int(now.timestamp() * 1000) & ((1 << 48) - 1)
+    rand = int.from_bytes(os.urandom(10), 'big')
+    value = (unix_ms << 80) | (rand & ((1 << 80) - 1))
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return uuid.UUID(int=value)
+
+
+def encode_cursor(created_at: str, contribution_id: str) -> str:
+    """Encode the last row's (created_at, id) as an opaque pagination cursor"""
+    return base64.urlsafe_b64encode(f"{created_at},{contribution_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Decode a pagination cursor, raising ValueError if it is malformed"""
+    try:
+        created_at, _, contribution_id = base64.urlsafe_b64decode(
+            cursor.encode()
+        ).decode().partition(',')
+    except (binascii.Error, UnicodeError) as e:
+        raise ValueError('Invalid cursor') from e
+    # Reject anything but a timestamp and a UUID before they reach the filter
+    datetime.fromisoformat(created_at)
+    uuid.UUID(contribution_id)
+    return created_at, contribution_id
+
+
+def invoice_age(contribution: Contribution, now: datetime) -> float:
+    """Seconds between the contribution's (and its invoice's) creation and now"""
+    if contribution.created_at is None:
+        return 0.0
+    created_at = contribution.created_at
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return (now - created_at).total_seconds()
+
+
+def confirmation_overdue(age: float) -> bool:
+    """
+    Whether a status check should ask LNbits directly: always when the
+    event stream is disabled, otherwise once the invoice has been pending
+    longer than LNBITS_STREAM_SLA
+    """
+    return not Config.LNBITS_SSE_ENABLED or age > Config.LNBITS_STREAM_SLA
+
+
+def claim_status_refresh(contribution_id: str) -> bool:
+    """Whether this caller should refresh the status from LNbits now"""
+    with _refresh_lock:
+        if contribution_id in _recent_refreshes:
+            return False
+        _recent_refreshes[contribution_id] = True
+        return True
+
+
+def refresh_payment_status(contribution_id: str, payment_hash: str):
+    """Ask LNbits whether a pending invoice was paid and record it if so"""
+    try:
+        payment_status = lnbits_service.check_invoice_status(payment_hash)
+        if payment_status['paid']:
+            mark_contribution_paid(payment_hash, payment_status.get('preimage'))
+            logger.info("Payment confirmed via status check: %s", contribution_id)
+    except LNbitsAPIError as e:
+        logger.error("Error checking LNbits status: %s", e)
+    except Exception as e:
+        logger.error("Error refreshing contribution status: %s", e)
 
 
-def btc_to_sats(btc: float) -> int:
-    """Convert BTC to satoshis"""
-    return int(btc * 100_000_000)
+def settled_before_expiry(contribution: Contribution) -> Optional[bool]:
+    """
+    Ask LNbits one last time whether an invoice past its expiry was paid,
+    recording the payment if so
+
+    Returns:
+        True if it was paid, False if it wasn't (safe to expire), or None if
+        LNbits couldn't say, in which case the contribution stays pending
+        until a later status check
+    """
+    payment_hash = contribution.get_payment_hash()
+    if not payment_hash:
+        return False
+
+    try:
+        payment_status = lnbits_service.check_invoice_status(payment_hash)
+    except LNbitsAPIError as e:
+        logger.error("Error checking LNbits status before expiry: %s", e)
+        return None
+    if not payment_status['paid']:
+        return False
+
+    mark_contribution_paid(payment_hash, payment_status.get('preimage'))
+    logger.info("Payment confirmed at expiry check: %s", contribution.id)
+    return True
+
+
+def poll_hint_ms(age: float) -> int:
+    """Suggested delay before the next status poll, backing off with age"""
+    # Clock skew between API hosts can make a fresh invoice's age negative
+    age = max(age, 0)
+    return min(POLL_HINT_MAX_MS, POLL_HINT_MIN_MS * 2 ** int(age // POLL_HINT_STEP))
 
 
 @contributions_bp.route('', methods=['POST'])
@@ -70,27 +228,25 @@ def create_contribution():
         if not data:
             return jsonify({'error': 'No data provided'}), 400
 
-        # Validate campaign exists and is active
-        campaign_id = data.get('campaign_id')
-        campaign_response = supabase.table('campaigns').select('*').eq(
-            'id', campaign_id
-        ).single().execute()
-
-        if not campaign_response.data:
-            return jsonify({'error': 'Campaign not found'}), 404
-
-        campaign = campaign_response.data
+        now = datetime.now(timezone.utc)
 
-        if campaign.get('status') != 'active':
-            return jsonify({'error': 'Campaign is not active'}), 400
+        # Look the campaign up while the payload is validated
+        campaign_id = data.get('campaign_id')
+        campaign_future = executor.submit(get_campaign_summary, campaign_id)
 
-        # Convert BTC to SATS if needed
+        # Convert to whole satoshis: the invoice, the stored amount and the
+        # campaign credit then all agree to the sat
         amount = data.get('amount', 0)
         currency = data.get('currency', 'SATS').upper()
 
-        if currency == 'BTC':
-            amount = btc_to_sats(amount)
-            currency = 'SATS'
+        try:
+            if currency == 'BTC':
+                amount = btc_to_sats(amount)
+                currency = 'SATS'
+            else:
+                amount = int(Decimal(str(amount)))
+        except (InvalidOperation, ValueError, OverflowError):
+            return jsonify({'error': 'Invalid amount'}), 400
 
         # Validate minimum amount (100 sats)
         if amount < 100:
@@ -100,74 +256,96 @@ def create_contribution():
         data['currency'] = currency
 
         # Create contribution model
-        contribution = Contribution(**data)
-        contribution.created_at = datetime.now()
+        contribution = Contribution.model_validate(data)
+        contribution.created_at = now
         contribution.payment_status = 'pending'
 
+        # Validate campaign exists and is active
+        campaign = campaign_future.result()
+
+        if not campaign:
+            return jsonify({'error': 'Campaign not found'}), 404
+
+        if campaign.get('status') != 'active':
+            return jsonify({'error': 'Campaign is not active'}), 400
+
         # Create LNbits Lightning invoice
         try:
             # Generate memo for the invoice
-            memo = f"CrowdPay: {campaign.get('title')[:50]}"
+            memo = campaign['memo_prefix']
             if contribution.contributor_name and not contribution.is_anonymous:
-                memo += f" from {contribution.contributor_name}"
+                memo = f"{memo} from {contribution.contributor_name}"
 
             # Create invoice via LNbits API
             payment_data = lnbits_service.create_invoice(
                 amount=int(amount),
                 memo=memo,
-                expiry=3600  # 1 hour expiry
+                expiry=INVOICE_EXPIRY
             )
 
-            # Store payment data in contribution
+            # Store payment data in contribution; to_dict() writes these to
+            # the legacy bitnob_* columns, once each
             contribution.lnbits_payment_hash = payment_data['payment_hash']
             contribution.lnbits_payment_request = payment_data['payment_request']
             contribution.lnbits_checking_id = payment_data['checking_id']
 
-            # Also store in legacy fields for DB compatibility
-            contribution.bitnob_payment_hash = payment_data['payment_hash']
-            contribution.bitnob_payment_request = payment_data['payment_request']
-            contribution.bitnob_payment_id = payment_data['checking_id']
-            contribution.bitnob_reference = f"contrib_{uuid.uuid4().hex[:12]}"
+            # Time-ordered id generated here, so the insert needn't return
+            # the row; the reference reuses it
+            contribution_uuid = uuid7(now)
+            contribution.id = str(contribution_uuid)
+            contribution.bitnob_reference = f"contrib_{contribution_uuid.hex}"
 
             # Handle anonymous contributions
             if contribution.is_anonymous:
                 contribution.contributor_name = None
                 contribution.contributor_email = None
 
-            # Insert contribution into database
-            contrib_data = contribution.to_dict()
-            contrib_data.pop('id', None)
-
-            response = supabase.table('contributions').insert(contrib_data).execute()
-            if not response.data:
-                return jsonify({'error': 'Failed to create contribution'}), 500
+            # One dump serves as both the response body and the insert payload
+            contribution_data = contribution.model_dump(mode='json')
 
-            created_contribution = Contribution.from_dict(response.data[0])
-
-            # Start polling for payment confirmation
-            polling_service.start_polling(
-                contribution_id=created_contribution.id,
-                payment_hash=payment_data['payment_hash'],
-                campaign_id=campaign_id
-            )
+            # Insert contribution into database, re-checking the campaign in
+            # the same call; the validated model is already the response, so
+            # no row comes back
+            try:
+                supabase.rpc('create_contribution_checked', {
+                    'cid': campaign_id,
+                    'payload': contribution.to_dict(contribution_data)
+                }).execute()
+            except PostgrestAPIError as e:
+                if e.code not in (CAMPAIGN_NOT_FOUND, CAMPAIGN_NOT_ACTIVE):
+                    raise
+                # The cached campaign summary was stale
+                forget_campaign(campaign_id)
+                if e.code == CAMPAIGN_NOT_FOUND:
+                    return jsonify({'error': 'Campaign not found'}), 404
+                return jsonify({'error': 'Campaign is not active'}), 400
+
+            # The LNbits event stream confirms the payment; poll only
+            # when it is disabled
+            if not Config.LNBITS_SSE_ENABLED:
+                polling_service.start_polling(
+                    contribution_id=contribution.id,
+                    payment_hash=payment_data['payment_hash'],
+                    campaign_id=campaign_id
+                )
 
-            logger.info(f"Contribution created: {created_contribution.id} with payment_hash: {payment_data['payment_hash']}")
+            logger.info("Contribution created: %s with payment_hash: %s", contribution.id, payment_data['payment_hash'])
 
             return jsonify({
                 'message': 'Contribution created successfully',
-                'contribution': created_contribution.dict(),
+                'contribution': contribution_data,
                 'payment_request': payment_data['payment_request'],
                 'payment_hash': payment_data['payment_hash']
             }), 201
 
         except LNbitsAPIError as e:
-            logger.error(f"Error creating LNbits invoice: {str(e)}")
+            logger.error("Error creating LNbits invoice: %s", e)
             return jsonify({'error': 'Payment processing error', 'details': str(e)}), 400
 
     except ValidationError as e:
         return jsonify({'error': 'Validation error', 'details': e.errors()}), 400
     except Exception as e:
-        logger.error(f"Error creating contribution: {str(e)}")
+        logger.error("Error creating contribution: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 
@@ -176,25 +354,25 @@ def create_contribution():
 def get_contribution(contribution_id):
     """Get a specific contribution by ID"""
     try:
-        response = supabase.table('contributions').select('*').eq(
-            'id', contribution_id
-        ).single().execute()
+        row = get_paid_contribution('detail', contribution_id)
+        if row is None:
+            # The view already redacts anonymous contributors
+            response = supabase.table('contributions_public').select('*').eq(
+                'id', contribution_id
+            ).single().execute()
 
-        if not response.data:
-            return jsonify({'error': 'Contribution not found'}), 404
+            if not response.data:
+                return jsonify({'error': 'Contribution not found'}), 404
 
-        contribution = Contribution.from_dict(response.data)
+            row = response.data
+            remember_contribution('detail', contribution_id, row)
 
-        # Hide personal info if anonymous
-        contrib_dict = contribution.dict()
-        if contribution.is_anonymous:
-            contrib_dict['contributor_name'] = 'Anonymous'
-            contrib_dict['contributor_email'] = None
+        contribution = Contribution.from_db_row(row)
 
-        return jsonify({'contribution': contrib_dict}), 200
+        return jsonify({'contribution': contribution.model_dump()}), 200
 
     except Exception as e:
-        logger.error(f"Error fetching contribution: {str(e)}")
+        logger.error("Error fetching contribution: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 
@@ -205,7 +383,16 @@ def check_contribution_status(contribution_id):
     Check the payment status of a contribution
 
     This endpoint is used by the frontend to poll for payment confirmation.
-    It checks LNbits directly for the latest status.
+    The stored status is kept current by the LNbits event stream; LNbits is
+    queried only for invoices pending longer than LNBITS_STREAM_SLA. That
+    query runs in the background (at most every STATUS_REFRESH_INTERVAL
+    seconds per contribution), so a payment it finds shows up on the next
+    poll. Once the invoice has expired LNbits is asked one last time, in the
+    request, and the contribution is marked expired only if it wasn't paid.
+
+    Responses carry an ETag (send If-None-Match to get a 304 while the
+    status is unchanged); pending ones also carry X-Poll-Next-Ms, the
+    suggested delay before polling again.
 
     Response:
     {
@@ -216,72 +403,75 @@ def check_contribution_status(contribution_id):
     }
     """
     try:
-        response = supabase.table('contributions').select('*').eq(
-            'id', contribution_id
-        ).single().execute()
+        # One clock read for the age check and any timestamps written below
+        now = datetime.now(timezone.utc)
 
-        if not response.data:
-            return jsonify({'error': 'Contribution not found'}), 404
-
-        contribution = Contribution.from_dict(response.data)
-
-        # If pending and has payment hash, check with LNbits
-        if contribution.is_pending() and contribution.get_payment_hash():
-            try:
-                payment_status = lnbits_service.check_invoice_status(
-                    contribution.get_payment_hash()
-                )
-
-                # Update if payment confirmed
-                if payment_status['paid'] and not contribution.is_paid():
-                    update_data = {
-                        'payment_status': 'paid',
-                        'paid_at': datetime.now().isoformat(),
-                        'transaction_id': payment_status.get('preimage'),
-                        'updated_at': datetime.now().isoformat()
-                    }
+        # Paid contributions never change, so their status is cached
+        row = get_paid_contribution('status', contribution_id)
+        if row is None:
+            response = supabase.table('contributions').select(STATUS_COLUMNS).eq(
+                'id', contribution_id
+            ).single().execute()
 
-                    supabase.table('contributions').update(update_data).eq(
-                        'id', contribution_id
-                    ).execute()
-
-                    # Update campaign amount
-                    campaign_id = contribution.campaign_id
-                    amount = contribution.amount
-                    platform_fee = amount * (Config.PLATFORM_FEE_PERCENT / 100)
-                    creator_amount = amount - platform_fee
-
-                    campaign_response = supabase.table('campaigns').select(
-                        'current_amount'
-                    ).eq('id', campaign_id).single().execute()
-
-                    if campaign_response.data:
-                        new_amount = campaign_response.data['current_amount'] + creator_amount
-                        supabase.table('campaigns').update({
-                            'current_amount': new_amount,
-                            'updated_at': datetime.now().isoformat()
-                        }).eq('id', campaign_id).execute()
-
-                    # Stop polling
-                    polling_service.stop_polling(contribution_id)
-
-                    contribution.payment_status = 'paid'
-                    contribution.paid_at = datetime.now()
+            if not response.data:
+                return jsonify({'error': 'Contribution not found'}), 404
+
+            row = response.data
+            remember_contribution('status', contribution_id, row)
+
+        contribution = Contribution.from_db_row(row)
+        age = invoice_age(contribution, now)
+
+        if contribution.is_pending() and age > INVOICE_EXPIRY:
+            # The invoice can no longer be paid, but it may have been paid
+            # before it expired with the event or poll missed: ask LNbits
+            # once before giving up on it, since expired is never revisited.
+            # If LNbits can't answer, later polls retry at most every
+            # STATUS_REFRESH_INTERVAL seconds and get the stored status between
+            settled = (
+                settled_before_expiry(contribution)
+                if claim_status_refresh(contribution_id) else None
+            )
+            if settled:
+                contribution.payment_status = 'paid'
+                contribution.paid_at = now
+            elif settled is False:
+                expired = supabase.table('contributions').update({
+                    'payment_status': 'expired',
+                    'updated_at': now.isoformat()
+                }).eq('id', contribution_id).eq('payment_status', 'pending').execute()
+                if expired.data:
+                    contribution.payment_status = 'expired'
+
+        # If pending and has payment hash, check with LNbits in the
+        # background; the client is polling, so the next poll sees the result.
+        # With the event stream enabled this is only a fallback for overdue
+        # confirmations
+        elif contribution.is_pending() and contribution.get_payment_hash() and \
+                confirmation_overdue(age) and claim_status_refresh(contribution_id):
+            refresh_executor.submit(
+                refresh_payment_status, contribution_id, contribution.get_payment_hash()
+            )
 
-                    logger.info(f"Payment confirmed via status check: {contribution_id}")
+        # Steady-state polls of an unchanged status get a bodiless 304
+        etag = compute_etag(contribution_id, contribution.payment_status, contribution.paid_at)
+        status_response = not_modified(etag)
+        if status_response is None:
+            status_response = with_etag(jsonify({
+                'contribution_id': contribution_id,
+                'payment_status': contribution.payment_status,
+                'is_paid': contribution.is_paid(),
+                'paid_at': contribution.paid_at
+            }), etag)
 
-            except LNbitsAPIError as e:
-                logger.error(f"Error checking LNbits status: {str(e)}")
+        # Only pending invoices are worth polling again
+        if contribution.is_pending():
+            status_response.headers['X-Poll-Next-Ms'] = str(poll_hint_ms(age))
 
-        return jsonify({
-            'contribution_id': contribution_id,
-            'payment_status': contribution.payment_status,
-            'is_paid': contribution.is_paid(),
-            'paid_at': contribution.paid_at.isoformat() if contribution.paid_at else None
-        }), 200
+        return status_response
 
     except Exception as e:
-        logger.error(f"Error checking contribution status: {str(e)}")
+        logger.error("Error checking contribution status: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 
@@ -297,7 +487,7 @@ def cancel_contribution(contribution_id):
         if not response.data:
             return jsonify({'error': 'Contribution not found'}), 404
 
-        contribution = Contribution.from_dict(response.data)
+        contribution = Contribution.from_db_row(response.data)
 
         # Can only cancel pending contributions
         if not contribution.is_pending():
@@ -307,23 +497,23 @@ def cancel_contribution(contribution_id):
 
         # Lightning invoices expire automatically, just stop polling
         if contribution.get_payment_hash():
-            logger.info(f"Invoice will expire automatically: {contribution.get_payment_hash()}")
+            logger.info("Invoice will expire automatically: %s", contribution.get_payment_hash())
 
         # Stop polling
         polling_service.stop_polling(contribution_id)
 
-        # Update contribution status
+        # Update contribution status, unless it was paid in the meantime
         supabase.table('contributions').update({
             'payment_status': 'cancelled',
-            'updated_at': datetime.now().isoformat()
-        }).eq('id', contribution_id).execute()
+            'updated_at': datetime.now(timezone.utc).isoformat()
+        }).eq('id', contribution_id).eq('payment_status', 'pending').execute()
 
-        logger.info(f"Contribution cancelled: {contribution_id}")
+        logger.info("Contribution cancelled: %s", contribution_id)
 
         return jsonify({'message': 'Contribution cancelled successfully'}), 200
 
     except Exception as e:
-        logger.error(f"Error cancelling contribution: {str(e)}")
+        logger.error("Error cancelling contribution: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 
@@ -337,9 +527,10 @@ def get_contributions():
         payment_status = request.args.get('payment_status')
         limit = request.args.get('limit', 50, type=int)
         offset = request.args.get('offset', 0, type=int)
+        cursor = request.args.get('cursor')
 
-        # Build query
-        query = supabase.table('contributions').select('*')
+        # Build query; the view already redacts anonymous contributors
+        query = supabase.table('contributions_public').select(LISTING_COLUMNS)
 
         if campaign_id:
             query = query.eq('campaign_id', campaign_id)
@@ -347,28 +538,38 @@ def get_contributions():
         if payment_status:
             query = query.eq('payment_status', payment_status)
 
-        # Execute query with pagination
-        response = query.order('created_at', desc=True).range(
-            offset, offset + limit - 1
-        ).execute()
+        # Newest first; id breaks ties between equal timestamps
+        query = query.order('created_at', desc=True).order('id', desc=True)
 
-        contributions = response.data
+        if cursor:
+            # Keyset pagination: resume after the last row of the previous
+            # page instead of scanning and discarding `offset` rows
+            try:
+                created_at, last_id = decode_cursor(cursor)
+            except ValueError:
+                return jsonify({'error': 'Invalid cursor'}), 400
+            query = query.or_(
+                f'created_at.lt."{created_at}",'
+                f'and(created_at.eq."{created_at}",id.lt.{last_id})'
+            ).limit(limit)
+        else:
+            query = query.range(offset, offset + limit - 1)
+
+        contributions = query.execute().data
 
-        # Filter anonymous contributor info
-        for contrib in contributions:
-            if contrib.get('is_anonymous'):
-                contrib['contributor_name'] = 'Anonymous'
-                contrib['contributor_email'] = None
+        last = contributions[-1] if len(contributions) == limit else None
+        next_cursor = encode_cursor(last['created_at'], last['id']) if last else None
 
         return jsonify({
             'contributions': contributions,
             'count': len(contributions),
             'offset': offset,
-            'limit': limit
+            'limit': limit,
+            'next_cursor': next_cursor
         }), 200
 
     except Exception as e:
-        logger.error(f"Error fetching contributions: {str(e)}")
+        logger.error("Error fetching contributions: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 
@@ -390,18 +591,26 @@ def lnbits_webhook():
     }
     """
     try:
-        # Get raw payload for signature verification
-        payload = request.get_data(as_text=True)
+        # Raw body bytes: the signature covers them and they are parsed once
+        payload = request.get_data(cache=False)
         signature = request.headers.get('X-LNbits-Signature', '')
 
-        # Verify webhook signature (optional but recommended)
+        # LNbits doesn't sign webhooks by default, so unsigned requests are
+        # accepted; a signature that doesn't match is rejected before the
+        # body is parsed
         if signature and not lnbits_service.verify_webhook_signature(payload, signature):
             logger.warning("Invalid webhook signature")
-            # Continue anyway as signature verification is optional for LNbits
+            return jsonify({'error': 'Invalid signature'}), 401
 
-        data = request.get_json()
+        if not payload:
+            return jsonify({'error': 'No data provided'}), 400
 
-        if not data:
+        try:
+            data = orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            return jsonify({'error': 'Invalid JSON'}), 400
+
+        if not data or not isinstance(data, dict):
             return jsonify({'error': 'No data provided'}), 400
 
         payment_hash = data.get('payment_hash')
@@ -414,59 +623,35 @@ def lnbits_webhook():
         if not is_paid:
             return jsonify({'message': 'Payment not yet confirmed'}), 200
 
-        # Find contribution by payment hash
-        response = supabase.table('contributions').select('*').eq(
-            'bitnob_payment_hash', payment_hash
-        ).execute()
-
-        if not response.data:
-            logger.warning(f"No contribution found for payment_hash: {payment_hash}")
-            return jsonify({'message': 'Contribution not found'}), 404
-
-        contribution_data = response.data[0]
-        contribution_id = contribution_data['id']
-        campaign_id = contribution_data['campaign_id']
-
-        # Check if already paid
-        if contribution_data['payment_status'] == 'paid':
-            logger.info(f"Contribution {contribution_id} already marked as paid")
+        # Retried deliveries stop here, before any Supabase round trip
+        dedupe_key = f'webhook:lnbits:{payment_hash}'
+        if not claim_once(dedupe_key, WEBHOOK_DEDUPE_TTL):
             return jsonify({'message': 'Already processed'}), 200
 
-        # Update contribution status
-        update_data = {
-            'payment_status': 'paid',
-            'paid_at': datetime.now().isoformat(),
-            'transaction_id': data.get('preimage'),
-            'updated_at': datetime.now().isoformat()
-        }
-
-        supabase.table('contributions').update(update_data).eq(
-            'id', contribution_id
-        ).execute()
-
-        # Update campaign amount with fee deduction
-        amount = contribution_data['amount']
-        platform_fee = amount * (Config.PLATFORM_FEE_PERCENT / 100)
-        creator_amount = amount - platform_fee
+        # Acknowledge right away and confirm in the next batch
+        if Config.CONFIRMATION_BATCH_INTERVAL > 0:
+            get_payment_queue().put(payment_hash, data.get('preimage'))
+            return jsonify({'message': 'Payment queued'}), 200
 
-        campaign_response = supabase.table('campaigns').select(
-            'current_amount'
-        ).eq('id', campaign_id).single().execute()
-
-        if campaign_response.data:
-            new_amount = campaign_response.data['current_amount'] + creator_amount
-            supabase.table('campaigns').update({
-                'current_amount': new_amount,
-                'updated_at': datetime.now().isoformat()
-            }).eq('id', campaign_id).execute()
+        try:
+            confirmed = mark_contribution_paid(payment_hash, data.get('preimage'))
+        except Exception:
+            # Let LNbits' retry through
+            cache_delete(dedupe_key)
+            raise
+
+        if confirmed is None:
+            cache_delete(dedupe_key)
+            return jsonify({'message': 'Contribution not found'}), 404
 
-        # Stop polling
-        polling_service.stop_polling(contribution_id)
+        if not confirmed:
+            logger.info("Payment %s already marked as paid", payment_hash)
+            return jsonify({'message': 'Already processed'}), 200
 
-        logger.info(f"Webhook: Payment confirmed for {contribution_id}")
+        logger.info("Webhook: Payment confirmed for %s", payment_hash)
 
         return jsonify({'message': 'Webhook processed successfully'}), 200
 
     except Exception as e:
-        logger.error(f"Error processing webhook: {str(e)}")
+        logger.error("Error processing webhook: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
@@ -5,30 +5,40 @@ Provides direct LNbits invoice/wallet operations:
 - POST /api/invoice/create - Create Lightning invoice
 - GET /api/invoice/status/<payment_hash> - Check invoice status
 - GET /api/wallet/balance - Get platform wallet balance
+- GET /api/wallet/summary - Get wallet balance and recent payments together
 - POST /api/webhooks/lnbits - LNbits webhook endpoint
 
 These routes complement the contribution routes by providing
 direct access to Lightning payment functionality.
 """
 
-from flask import Blueprint, request, jsonify
+from flask import request, jsonify
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import logging
 
 from services.auth import optional_auth, require_auth
-from services import get_supabase_client, LNbitsService, InvoicePollingService
+from . import payments_bp
+from .contributions import lnbits_webhook as contribution_webhook
+from services import get_supabase_client, get_lnbits_service
 from services.lnbits import LNbitsAPIError
+from pydantic import BaseModel, Field, ValidationError
 from config import Config
 
 logger = logging.getLogger(__name__)
 
-# Create blueprint
-payments_bp = Blueprint('payments', __name__)
-
 # Initialize services
-lnbits_service = LNbitsService()
+lnbits_service = get_lnbits_service()
 supabase = get_supabase_client()
-polling_service = InvoicePollingService()
+
+# Runs independent LNbits calls concurrently within a request
+executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='payments-io')
+
+
+class CreateInvoiceRequest(BaseModel):
+    amount: int = Field(..., ge=1, le=10_000_000)  # 0.1 BTC max
+    memo: str = 'CrowdPay Payment'
+    expiry: int = Field(3600, ge=60, le=86400)
 
 
 @payments_bp.route('/invoice/create', methods=['POST'])
@@ -57,39 +67,32 @@ def create_invoice():
     }
     """
     try:
-        data = request.get_json() or {}
-
-        amount = data.get('amount')
-        memo = data.get('memo', 'CrowdPay Payment')
-        expiry = data.get('expiry', 3600)
-
-        if not amount or amount < 1:
-            return jsonify({'error': 'Amount must be at least 1 satoshi'}), 400
-
-        if amount > 10_000_000:  # 0.1 BTC max
-            return jsonify({'error': 'Amount exceeds maximum (10,000,000 sats)'}), 400
+        # Rejects bad bodies before any LNbits call
+        invoice = CreateInvoiceRequest.model_validate(request.get_json(silent=True) or {})
 
         invoice_data = lnbits_service.create_invoice(
-            amount=int(amount),
-            memo=memo,
-            expiry=expiry
+            amount=invoice.amount,
+            memo=invoice.memo,
+            expiry=invoice.expiry
         )
 
-        logger.info(f"Invoice created: {invoice_data['payment_hash']}")
+        logger.info("Invoice created: %s", invoice_data['payment_hash'])
 
         return jsonify({
             'payment_hash': invoice_data['payment_hash'],
             'payment_request': invoice_data['payment_request'],
-            'amount': amount,
-            'memo': memo,
-            'expiry': expiry
+            'amount': invoice.amount,
+            'memo': invoice.memo,
+            'expiry': invoice.expiry
         }), 201
 
+    except ValidationError as e:
+        return jsonify({'error': 'Validation error', 'details': e.errors()}), 400
     except LNbitsAPIError as e:
-        logger.error(f"Error creating invoice: {str(e)}")
+        logger.error("Error creating invoice: %s", e)
         return jsonify({'error': 'Failed to create invoice', 'details': str(e)}), 400
     except Exception as e:
-        logger.error(f"Unexpected error creating invoice: {str(e)}")
+        logger.error("Unexpected error creating invoice: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 
@@ -124,10 +127,10 @@ def check_invoice_status(payment_hash):
         }), 200
 
     except LNbitsAPIError as e:
-        logger.error(f"Error checking invoice status: {str(e)}")
+        logger.error("Error checking invoice status: %s", e)
         return jsonify({'error': 'Failed to check status', 'details': str(e)}), 400
     except Exception as e:
-        logger.error(f"Unexpected error checking invoice status: {str(e)}")
+        logger.error("Unexpected error checking invoice status: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 
@@ -169,10 +172,10 @@ def decode_invoice():
         }), 200
 
     except LNbitsAPIError as e:
-        logger.error(f"Error decoding invoice: {str(e)}")
+        logger.error("Error decoding invoice: %s", e)
         return jsonify({'error': 'Failed to decode invoice', 'details': str(e)}), 400
     except Exception as e:
-        logger.error(f"Unexpected error decoding invoice: {str(e)}")
+        logger.error("Unexpected error decoding invoice: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 
@@ -203,10 +206,10 @@ def get_wallet_balance():
         }), 200
 
     except LNbitsAPIError as e:
-        logger.error(f"Error getting wallet balance: {str(e)}")
+        logger.error("Error getting wallet balance: %s", e)
         return jsonify({'error': 'Failed to get balance', 'details': str(e)}), 400
     except Exception as e:
-        logger.error(f"Unexpected error getting wallet balance: {str(e)}")
+        logger.error("Unexpected error getting wallet balance: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 
@@ -239,64 +242,70 @@ def get_wallet_payments():
         }), 200
 
     except LNbitsAPIError as e:
-        logger.error(f"Error getting payments: {str(e)}")
+        logger.error("Error getting payments: %s", e)
         return jsonify({'error': 'Failed to get payments', 'details': str(e)}), 400
     except Exception as e:
-        logger.error(f"Unexpected error getting payments: {str(e)}")
+        logger.error("Unexpected error getting payments: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 
-@payments_bp.route('/webhooks/lnbits', methods=['POST'])
-def lnbits_webhook():
+@payments_bp.route('/wallet/summary', methods=['GET'])
+@require_auth
+def get_wallet_summary():
     """
-    Webhook endpoint for LNbits payment notifications
+    Get the wallet balance and recent payments in one call
 
-    This is an alternative endpoint to /api/contributions/webhook
-    that can be used with LNbits webhook configuration.
+    Both LNbits requests run concurrently, so a dashboard waits for the
+    slower of the two instead of their sum.
 
-    LNbits sends a POST when payment is received:
+    Query params:
+    - limit: Number of payments to return (default 20, max 100)
+
+    Response:
     {
-        "payment_hash": "abc123...",
-        "payment_request": "lnbc...",
-        "amount": 1000,
-        "memo": "...",
-        "paid": true
+        "balance_sats": 100000,
+        "balance_btc": 0.001,
+        "balance_msats": 100000000,
+        "wallet_id": "...",
+        "wallet_name": "...",
+        "payments": [...],
+        "count": 20
     }
     """
     try:
-        payload = request.get_data(as_text=True)
-        signature = request.headers.get('X-LNbits-Signature', '')
-
-        # Verify signature if provided
-        if signature and not lnbits_service.verify_webhook_signature(payload, signature):
-            logger.warning("Invalid webhook signature (continuing anyway)")
+        limit = min(request.args.get('limit', 20, type=int), 100)
 
-        data = request.get_json()
-
-        if not data:
-            return jsonify({'error': 'No data provided'}), 400
-
-        payment_hash = data.get('payment_hash')
-        is_paid = data.get('paid', False)
+        payments_future = executor.submit(lnbits_service.get_payments, limit=limit)
+        wallet_data = lnbits_service.get_wallet_details()
+        payments_data = payments_future.result()
 
-        if not payment_hash:
-            return jsonify({'error': 'Payment hash required'}), 400
+        return jsonify({
+            'balance_sats': wallet_data['balance_sats'],
+            'balance_btc': wallet_data['balance_btc'],
+            'balance_msats': wallet_data['balance_msats'],
+            'wallet_id': wallet_data.get('id'),
+            'wallet_name': wallet_data.get('name'),
+            'payments': payments_data['payments'],
+            'count': payments_data['count']
+        }), 200
 
-        if not is_paid:
-            return jsonify({'message': 'Payment not confirmed'}), 200
+    except LNbitsAPIError as e:
+        logger.error("Error getting wallet summary: %s", e)
+        return jsonify({'error': 'Failed to get wallet summary', 'details': str(e)}), 400
+    except Exception as e:
+        logger.error("Unexpected error getting wallet summary: %s", e)
+        return jsonify({'error': 'Internal server error'}), 500
 
-        # Use polling service to handle the payment
-        success = polling_service.handle_webhook_payment(payment_hash)
 
-        if success:
-            logger.info(f"Webhook payment processed: {payment_hash}")
-            return jsonify({'message': 'Payment processed'}), 200
-        else:
-            return jsonify({'message': 'Payment not found or already processed'}), 200
+@payments_bp.route('/webhooks/lnbits', methods=['POST'])
+def lnbits_webhook():
+    """
+    Webhook endpoint for LNbits payment notifications
 
-    except Exception as e:
-        logger.error(f"Error processing webhook: {str(e)}")
-        return jsonify({'error': 'Internal server error'}), 500
+    Alias of /api/contributions/webhook for LNbits webhook configuration;
+    both URLs confirm payments through the same handler.
+    """
+    return contribution_webhook()
 
 
 @payments_bp.route('/health', methods=['GET'])
@@ -318,14 +327,14 @@ def payments_health():
         }), 200
 
     except LNbitsAPIError as e:
-        logger.error(f"LNbits health check failed: {str(e)}")
+        logger.error("LNbits health check failed: %s", e)
         return jsonify({
             'status': 'degraded',
             'lnbits_connected': False,
             'error': str(e)
         }), 503
     except Exception as e:
-        logger.error(f"Health check error: {str(e)}")
+        logger.error("Health check error: %s", e)
         return jsonify({
             'status': 'unhealthy',
             'error': str(e)
@@ -1,7 +1,23 @@
 from .supabase_client import get_supabase_client
-from .lnbits import LNbitsService
-from .invoice_polling import InvoicePollingService
-from .auth import AuthService
+from .lnbits import LNbitsService, get_lnbits_service
+from .invoice_polling import InvoicePollingService, get_polling_service
+from .payments import mark_contribution_paid
+from .payment_queue import PaymentConfirmationQueue, get_payment_queue
+from .invoice_events import InvoiceEventSubscriber, get_invoice_subscriber
+from .auth import AuthService, get_auth_service
+from .campaign_cache import get_campaign_summary, forget_campaign, invalidate_campaign
+from .contribution_cache import get_paid_contribution, remember_contribution
+from .cache import (
+    get_redis_client, cache_get, cache_set, cache_delete, claim_once,
+    campaign_cache_key
+)
 
 
-__all__ = ['get_supabase_client', 'LNbitsService', 'InvoicePollingService', 'AuthService']
+__all__ = [
+    'get_supabase_client', 'LNbitsService', 'get_lnbits_service', 'InvoicePollingService',
+    'get_polling_service', 'AuthService', 'get_auth_service', 'get_redis_client', 'cache_get',
+    'cache_set', 'cache_delete', 'claim_once', 'campaign_cache_key', 'invalidate_campaign',
+    'mark_contribution_paid', 'InvoiceEventSubscriber', 'get_invoice_subscriber',
+    'get_campaign_summary', 'forget_campaign', 'PaymentConfirmationQueue',
+    'get_payment_queue', 'get_paid_contribution', 'remember_contribution'
+]
@@ -1,6 +1,10 @@
+import hashlib
 import logging
-from typing import Dict, Any, Optional
+import threading
+import time
+from typing import Dict, Any, Optional, Tuple
 from functools import wraps
+from cachetools import TLRUCache
 from flask import request, jsonify
 import jwt
 from config import Config
@@ -8,11 +12,66 @@ from services.supabase_client import get_supabase_client
 
 logger = logging.getLogger(__name__)
 
+_auth_service: Optional['AuthService'] = None
+
+
+def _token_cache_ttl(token: str) -> float:
+    """
+    Seconds a token's user may be cached: USER_CACHE_TTL, cut short when the
+    token expires sooner (<= 0 if it already has)
+
+    Only reads the exp claim; callers cache a user only after the token
+    itself was verified.
+    """
+    try:
+        exp = jwt.decode(token, options={'verify_signature': False}).get('exp')
+    except jwt.PyJWTError:
+        return Config.USER_CACHE_TTL
+    if not isinstance(exp, (int, float)):
+        return Config.USER_CACHE_TTL
+    return min(Config.USER_CACHE_TTL, exp - time.time())
+
+
+def _expires_with_token(_key, entry: Tuple[Any, float], now: float) -> float:
+    """TLRUCache expiry for (value, ttl) entries cached per token"""
+    return now + entry[1]
+
+
+# Token -> (user, ttl) for the auth decorators and /api/auth token checks,
+# keyed by a hash of the token; short enough that a revoked token stops
+# working within USER_CACHE_TTL seconds, and never outliving the token's exp
+_token_users = TLRUCache(maxsize=10_000, ttu=_expires_with_token)
+_token_users_lock = threading.Lock()
+
+
+def token_key(token: str) -> bytes:
+    """Hash the access token so raw tokens are never held in memory"""
+    return hashlib.sha256(token.encode()).digest()
+
+
+def _remember_token_user(key: bytes, token: str, user: Dict[str, Any]):
+    """Cache a verified token's user until the TTL or the token's exp"""
+    ttl = _token_cache_ttl(token)
+    if ttl > 0:
+        with _token_users_lock:
+            _token_users[key] = (user, ttl)
+
+
+def forget_token(token: str):
+    """Stop serving a token's user from the cache (e.g. on signout)"""
+    with _token_users_lock:
+        _token_users.pop(token_key(token), None)
+
+
 class AuthService:
     """Service for handling authentication"""
     
     def __init__(self):
         self.supabase = get_supabase_client()
+        # Local token verification keys; tokens they can't check go to
+        # Supabase Auth
+        self.jwt_secret = Config.SUPABASE_JWT_SECRET
+        self.jwks_client = jwt.PyJWKClient(Config.SUPABASE_JWKS_URL) if Config.SUPABASE_JWKS_URL else None
     
     def sign_up(self, email: str, password: str, 
                 full_name: Optional[str] = None) -> Dict[str, Any]:
@@ -41,7 +100,7 @@ class AuthService:
             response = self.supabase.auth.sign_up(data)
             
             if response.user:
-                logger.info(f"User signed up successfully: {email}")
+                logger.info("User signed up successfully: %s", email)
                 return {
                     'user': {
                         'id': response.user.id,
@@ -57,7 +116,7 @@ class AuthService:
                 raise Exception("Sign up failed")
                 
         except Exception as e:
-            logger.error(f"Sign up error: {str(e)}")
+            logger.error("Sign up error: %s", e)
             raise
     
     def sign_in(self, email: str, password: str) -> Dict[str, Any]:
@@ -77,7 +136,7 @@ class AuthService:
                 'password': password
             })
             
-            logger.info(f"User signed in: {email}")
+            logger.info("User signed in: %s", email)
             
             return {
                 'user': {
@@ -93,7 +152,7 @@ class AuthService:
             }
             
         except Exception as e:
-            logger.error(f"Sign in error: {str(e)}")
+            logger.error("Sign in error: %s", e)
             raise
     
     def sign_out(self, access_token: str) -> bool:
@@ -102,12 +161,18 @@ class AuthService:
             self.supabase.auth.sign_out()
             return True
         except Exception as e:
-            logger.error(f"Sign out error: {str(e)}")
+            logger.error("Sign out error: %s", e)
             return False
     
     def get_user_from_token(self, token: str) -> Optional[Dict[str, Any]]:
         """
         Get user info from JWT token
+
+        With SUPABASE_JWT_SECRET or SUPABASE_JWKS_URL set the token is
+        verified locally; otherwise, or if it can't be, Supabase Auth is
+        asked. Valid tokens are remembered for USER_CACHE_TTL seconds (less
+        if the token expires sooner), so repeated requests with the same
+        token skip both.
         
         Args:
             token: JWT access token
@@ -115,21 +180,75 @@ class AuthService:
         Returns:
             User data or None
         """
+        key = token_key(token)
+        with _token_users_lock:
+            entry = _token_users.get(key)
+        if entry is not None:
+            return entry[0]
+
+        try:
+            claims = self._decode_token(token)
+        except jwt.ExpiredSignatureError:
+            return None
+        except jwt.PyJWTError as e:
+            logger.warning("Local token verification failed, asking Supabase: %s", e)
+            claims = None
+
+        if claims is not None:
+            user = {
+                'id': claims['sub'],
+                'email': claims.get('email'),
+                'full_name': (claims.get('user_metadata') or {}).get('full_name')
+            }
+            _remember_token_user(key, token, user)
+            return user
+
         try:
             response = self.supabase.auth.get_user(token)
             
             if response.user:
-                return {
+                user = {
                     'id': response.user.id,
                     'email': response.user.email,
                     'full_name': response.user.user_metadata.get('full_name')
                 }
+                _remember_token_user(key, token, user)
+                return user
             return None
             
         except Exception as e:
-            logger.error(f"Get user error: {str(e)}")
+            logger.error("Get user error: %s", e)
             return None
     
+    def _decode_token(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Verify a Supabase access token with the project's signing keys
+
+        Returns:
+            The token's claims, or None if no local key is configured for
+            its algorithm
+
+        Raises:
+            jwt.PyJWTError: If the token is malformed, expired or its
+                signature doesn't verify
+        """
+        if not self.jwt_secret and self.jwks_client is None:
+            return None
+
+        algorithm = jwt.get_unverified_header(token).get('alg')
+
+        if algorithm == 'HS256' and self.jwt_secret:
+            key = self.jwt_secret
+        elif algorithm in ('RS256', 'ES256') and self.jwks_client:
+            key = self.jwks_client.get_signing_key_from_jwt(token).key
+        else:
+            return None
+
+        return jwt.decode(
+            token, key, algorithms=[algorithm], audience='authenticated',
+            options={'require': ['sub', 'exp']}
+        )
+
     def refresh_session(self, refresh_token: str) -> Dict[str, Any]:
         """Refresh access token using refresh token"""
         try:
@@ -142,10 +261,20 @@ class AuthService:
             }
             
         except Exception as e:
-            logger.error(f"Refresh session error: {str(e)}")
+            logger.error("Refresh session error: %s", e)
             raise
 
 
+def get_auth_service() -> AuthService:
+    """Get or create the process-wide auth service used by the decorators"""
+    global _auth_service
+
+    if _auth_service is None:
+        _auth_service = AuthService()
+
+    return _auth_service
+
+
 def require_auth(f):
     """Decorator to require authentication for routes"""
     @wraps(f)
@@ -159,8 +288,7 @@ def require_auth(f):
         token = auth_header.split(' ')[1]
         
         # Get user from token
-        auth_service = AuthService()
-        user = auth_service.get_user_from_token(token)
+        user = get_auth_service().get_user_from_token(token)
         
         if not user:
             return jsonify({'error': 'Invalid or expired token'}), 401
@@ -181,8 +309,7 @@ def optional_auth(f):
         
         if auth_header and auth_header.startswith('Bearer '):
             token = auth_header.split(' ')[1]
-            auth_service = AuthService()
-            user = auth_service.get_user_from_token(token)
+            user = get_auth_service().get_user_from_token(token)
             request.user = user
         else:
             request.user = None
@@ -0,0 +1,90 @@
+"""
+Optional Redis cache shared by all workers
+
+Caching is disabled unless REDIS_URL is set: lookups miss and writes are
+no-ops. Redis errors are logged and treated the same way, so a Redis outage
+only costs the extra Supabase round trips.
+"""
+
+import logging
+from functools import lru_cache
+from typing import Optional
+
+import redis
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def get_redis_client() -> Optional[redis.Redis]:
+    """Get the pooled Redis client, or None when caching is disabled"""
+    if not Config.REDIS_URL:
+        return None
+
+    pool = redis.ConnectionPool.from_url(
+        Config.REDIS_URL,
+        max_connections=Config.REDIS_MAX_CONNECTIONS,
+        socket_timeout=0.5,
+        socket_connect_timeout=0.5
+    )
+    return redis.Redis(connection_pool=pool)
+
+
+def cache_get(key: str) -> Optional[bytes]:
+    """Return the cached bytes for key, or None on a miss"""
+    client = get_redis_client()
+    if client is None:
+        return None
+    try:
+        return client.get(key)
+    except redis.RedisError as e:
+        logger.warning("Redis get failed for %s: %s", key, e)
+        return None
+
+
+def cache_set(key: str, value: bytes, ttl: int):
+    """Store value under key for ttl seconds"""
+    client = get_redis_client()
+    if client is None:
+        return
+    try:
+        client.setex(key, ttl, value)
+    except redis.RedisError as e:
+        logger.warning("Redis set failed for %s: %s", key, e)
+
+
+def cache_delete(*keys: str):
+    """Invalidate one or more keys"""
+    client = get_redis_client()
+    if client is None or not keys:
+        return
+    try:
+        client.delete(*keys)
+    except redis.RedisError as e:
+        logger.warning("Redis delete failed for %s: %s", keys, e)
+
+
+def claim_once(key: str, ttl: int) -> bool:
+    """
+    Atomically claim key for ttl seconds (SET NX EX)
+
+    Returns False only when another request already holds the claim. Without
+    Redis, or if Redis fails, every caller gets the claim, so callers must
+    stay idempotent on their own.
+    """
+    client = get_redis_client()
+    if client is None:
+        return True
+    try:
+        return bool(client.set(key, b'1', nx=True, ex=ttl))
+    except redis.RedisError as e:
+        logger.warning("Redis claim failed for %s: %s", key, e)
+        return True
+
+
+def campaign_cache_key(campaign_id: str) -> str:
+    """Key for a cached GET /api/campaigns/<id> response"""
+    return f'campaign:{campaign_id}:v1'
+
@@ -0,0 +1,77 @@
+"""
+Short-lived cache of campaign fields read when contributing
+
+create_contribution only needs a campaign's status and title, and campaigns
+change far less often than they receive contributions, so those fields are
+kept for a few seconds in process and, when Redis is configured, shared
+across workers so a cold worker doesn't go to Supabase either.
+"""
+
+import threading
+from typing import Any, Dict, Optional
+
+import orjson
+from cachetools import TTLCache
+
+from .cache import cache_delete, cache_get, cache_set, campaign_cache_key
+from .supabase_client import get_supabase_client
+
+# Only the fields create_contribution reads
+CAMPAIGN_SUMMARY_COLUMNS = 'status, title'
+
+# Every campaign write drops the shared copy, so it can outlive the local one
+SUMMARY_REDIS_TTL = 300
+
+_summaries = TTLCache(maxsize=4096, ttl=15)
+_lock = threading.Lock()
+
+
+def campaign_summary_key(campaign_id: str) -> str:
+    """Key for a campaign summary shared through Redis"""
+    return f'campaign:{campaign_id}:summary:v1'
+
+
+def get_campaign_summary(campaign_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the campaign's status, title and invoice memo prefix, or None if
+    it doesn't exist
+    """
+    with _lock:
+        summary = _summaries.get(campaign_id)
+    if summary is not None:
+        return summary
+
+    cached = cache_get(campaign_summary_key(campaign_id))
+    if cached is not None:
+        summary = orjson.loads(cached)
+    else:
+        response = get_supabase_client().table('campaigns').select(
+            CAMPAIGN_SUMMARY_COLUMNS
+        ).eq('id', campaign_id).limit(1).execute()
+
+        if not response.data:
+            return None
+
+        summary = response.data[0]
+        # Invoice memo prefix, built once per cached campaign
+        summary['memo_prefix'] = f"CrowdPay: {(summary.get('title') or '')[:50]}"
+        cache_set(campaign_summary_key(campaign_id), orjson.dumps(summary), SUMMARY_REDIS_TTL)
+
+    with _lock:
+        _summaries[campaign_id] = summary
+    return summary
+
+
+def forget_campaign(campaign_id: str):
+    """Drop a cached summary after the campaign changes"""
+    with _lock:
+        _summaries.pop(campaign_id, None)
+    cache_delete(campaign_summary_key(campaign_id))
+
+
+def invalidate_campaign(campaign_id: str):
+    """Drop cached copies of a campaign after its row changes"""
+    with _lock:
+        _summaries.pop(campaign_id, None)
+    # One round trip for the shared summary and the cached detail response
+    cache_delete(campaign_summary_key(campaign_id), campaign_cache_key(campaign_id))
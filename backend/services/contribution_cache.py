@@ -0,0 +1,31 @@
+"""
+In-process cache of paid contribution reads
+
+A paid contribution is final: every write path skips rows that are already
+paid. Detail and status reads of paid contributions (receipts, payment tabs
+left open and still polling) are therefore served from memory, while
+pending ones always go to the database.
+"""
+
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from cachetools import TTLCache
+
+_rows = TTLCache(maxsize=50_000, ttl=300)
+_lock = threading.Lock()
+
+
+def get_paid_contribution(kind: str, contribution_id: str) -> Optional[Dict[str, Any]]:
+    """Return a cached row of the given kind ('detail' or 'status'), or None"""
+    with _lock:
+        return _rows.get((kind, contribution_id))
+
+
+def remember_contribution(kind: str, contribution_id: str, row: Dict[str, Any]):
+    """Cache a row if its contribution is paid; other rows may still change"""
+    if row.get('payment_status') != 'paid':
+        return
+    key: Tuple[str, str] = (kind, contribution_id)
+    with _lock:
+        _rows[key] = row
@@ -0,0 +1,130 @@
+"""
+LNbits Payment Event Subscriber
+
+Keeps one Server-Sent Events connection per host to LNbits
+(/api/v1/payments/sse) and marks contributions paid as payment notifications
+arrive, so pending invoices are not polled one by one. The stream is reopened
+with exponential backoff whenever it drops.
+
+Every gunicorn worker starts a subscriber, but only the one holding an
+exclusive lock on LEADER_LOCK_PATH opens the stream; the others retry the
+lock every LEADER_RETRY_DELAY seconds and take over if the leader dies (the
+OS releases the lock with the process). Separate hosts each keep a stream,
+which is harmless: confirming a payment twice changes nothing.
+
+Fallback: GET /api/contributions/<id>/status still asks LNbits directly about
+invoices that have been pending longer than LNBITS_STREAM_SLA.
+"""
+
+import fcntl
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from .lnbits import LNbitsService, LNbitsAPIError
+from .payments import mark_contribution_paid
+from .payment_queue import get_payment_queue
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Reconnect delay bounds (seconds) after the stream drops
+RECONNECT_MIN_DELAY = 1
+RECONNECT_MAX_DELAY = 60
+
+# Held by the one worker per host that streams events
+LEADER_LOCK_PATH = os.path.join(tempfile.gettempdir(), 'crowdpay-lnbits-events.lock')
+# Seconds between attempts by the other workers to take over the stream
+LEADER_RETRY_DELAY = 15
+
+_invoice_subscriber: Optional['InvoiceEventSubscriber'] = None
+
+
+class InvoiceEventSubscriber:
+    """Listens for LNbits payment events and confirms matching contributions"""
+
+    def __init__(self):
+        # Own client: the stream holds its connection open indefinitely
+        self.lnbits_service = LNbitsService()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._leader_lock = None
+
+    def start(self):
+        """Start the background listener (no-op if already running)"""
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._worker = threading.Thread(
+                target=self._listen, name='lnbits-events', daemon=True
+            )
+            self._worker.start()
+
+    def _acquire_leadership(self) -> bool:
+        """Try to become the worker that streams events for this host"""
+        handle = open(LEADER_LOCK_PATH, 'a')
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return False
+        # Kept open for the life of the process; closing it would release the lock
+        self._leader_lock = handle
+        return True
+
+    def _listen(self):
+        """Consume the event stream forever, reconnecting when it ends"""
+        while not self._acquire_leadership():
+            time.sleep(LEADER_RETRY_DELAY)
+        logger.info("Streaming LNbits payment events for this host")
+
+        delay = RECONNECT_MIN_DELAY
+        while True:
+            try:
+                for event, payment in self.lnbits_service.stream_payment_events():
+                    delay = RECONNECT_MIN_DELAY
+                    self._handle_event(event, payment)
+                logger.warning("LNbits payment event stream closed")
+            except LNbitsAPIError as e:
+                logger.error("LNbits payment event stream error: %s", e)
+            except Exception as e:
+                logger.error("Unexpected payment event error: %s", e)
+
+            time.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
+
+    def _handle_event(self, event: str, payment: Dict[str, Any]):
+        """Confirm the contribution behind a settled incoming payment"""
+        if event != 'payment-received':
+            return
+
+        # Outgoing payments carry a negative amount; pending ones aren't settled
+        if payment.get('amount', 0) <= 0 or payment.get('pending', False):
+            return
+
+        payment_hash = payment.get('payment_hash')
+        if not payment_hash:
+            return
+
+        # Bursts of events are confirmed in batches when queueing is enabled
+        if Config.CONFIRMATION_BATCH_INTERVAL > 0:
+            get_payment_queue().put(payment_hash, payment.get('preimage'))
+            return
+
+        try:
+            mark_contribution_paid(payment_hash, payment.get('preimage'))
+        except Exception as e:
+            logger.error("Failed to confirm payment %s: %s", payment_hash, e)
+
+
+def get_invoice_subscriber() -> InvoiceEventSubscriber:
+    """Get or create the process-wide payment event subscriber"""
+    global _invoice_subscriber
+
+    if _invoice_subscriber is None:
+        _invoice_subscriber = InvoiceEventSubscriber()
+
+    return _invoice_subscriber
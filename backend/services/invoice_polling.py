@@ -2,7 +2,8 @@
 Invoice Polling Service for LNbits Lightning Payments
 
 This service polls LNbits to check payment status for pending invoices.
-It runs in a background thread and updates contribution/campaign records
+A single background thread wakes up every POLLING_INTERVAL seconds, checks
+all pending invoices concurrently, and updates contribution/campaign records
 when payments are confirmed.
 
 Alternative: LNbits webhooks can be used instead of polling for
@@ -11,24 +12,41 @@ real-time notifications (see /api/webhooks/lnbits endpoint).
 
 import logging
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Callable, Optional
+from typing import Any, Dict, Callable, List, Optional
 
-from .lnbits import LNbitsService, LNbitsAPIError
+from .lnbits import LNbitsAPIError, get_lnbits_service
+from .payments import mark_contribution_paid
 from .supabase_client import get_supabase_client
 from config import Config
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent LNbits status checks per poll cycle
+MAX_CONCURRENT_CHECKS = 16
+
+# LNbits statuses after which an unpaid invoice can't be paid any more
+CLOSED_STATUSES = frozenset(('expired', 'cancelled', 'failed'))
+
+_polling_service: Optional['InvoicePollingService'] = None
+
 
 class InvoicePollingService:
     """Service for polling LNbits Lightning invoices and updating contributions"""
 
     def __init__(self):
-        self.lnbits_service = LNbitsService()
+        self.lnbits_service = get_lnbits_service()
         self.supabase = get_supabase_client()
-        self.polling_threads: Dict[str, threading.Thread] = {}
-        self.stop_flags: Dict[str, threading.Event] = {}
+        # contribution_id -> payment_hash, campaign_id, started_at, callback
+        self.pending: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=MAX_CONCURRENT_CHECKS,
+            thread_name_prefix='invoice-poll'
+        )
 
     def start_polling(
         self,
@@ -46,279 +64,158 @@ class InvoicePollingService:
             campaign_id: The campaign ID to update on payment
             callback: Optional callback function on payment confirmation
         """
-        if contribution_id in self.polling_threads:
-            logger.warning(f"Polling already active for contribution {contribution_id}")
-            return
+        with self._lock:
+            if contribution_id in self.pending:
+                logger.warning("Polling already active for contribution %s", contribution_id)
+                return
 
-        stop_flag = threading.Event()
-        self.stop_flags[contribution_id] = stop_flag
+            self.pending[contribution_id] = {
+                'payment_hash': payment_hash,
+                'campaign_id': campaign_id,
+                'started_at': datetime.now(timezone.utc),
+                'callback': callback
+            }
 
-        thread = threading.Thread(
-            target=self._poll_payment,
-            args=(contribution_id, payment_hash, campaign_id, stop_flag, callback),
-            daemon=True
-        )
-
-        self.polling_threads[contribution_id] = thread
-        thread.start()
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._poll_loop, daemon=True)
+                self._worker.start()
 
-        logger.info(f"Started polling for contribution {contribution_id} (payment_hash: {payment_hash})")
+        logger.info("Started polling for contribution %s (payment_hash: %s)", contribution_id, payment_hash)
 
     def stop_polling(self, contribution_id: str):
         """Stop polling for a specific contribution"""
-        if contribution_id in self.stop_flags:
-            self.stop_flags[contribution_id].set()
-            logger.info(f"Stopped polling for contribution {contribution_id}")
+        with self._lock:
+            stopped = self.pending.pop(contribution_id, None) is not None
+        if stopped:
+            logger.info("Stopped polling for contribution %s", contribution_id)
 
-    def _poll_payment(
-        self,
-        contribution_id: str,
-        payment_hash: str,
-        campaign_id: str,
-        stop_flag: threading.Event,
-        callback: Optional[Callable]
-    ):
+    def _poll_loop(self):
         """
-        Background thread that polls LNbits for payment status
+        Background thread that polls LNbits for all pending invoices
 
-        Polls at POLLING_INTERVAL until:
-        - Payment is confirmed (paid=True)
-        - Payment expires or fails
-        - Timeout is reached (POLLING_TIMEOUT)
-        - stop_polling() is called
+        Every POLLING_INTERVAL the pending invoices are checked as one batch
+        until each is confirmed, expires or fails, reaches POLLING_TIMEOUT,
+        or stop_polling() is called. The thread exits once nothing is pending.
         """
-        start_time = datetime.now(timezone.utc)
+        while True:
+            time.sleep(Config.POLLING_INTERVAL)
+
+            with self._lock:
+                if not self.pending:
+                    self._worker = None
+                    return
+                batch = dict(self.pending)
+
+            try:
+                self._poll_batch(batch)
+            except Exception as e:
+                logger.error("Unexpected polling error: %s", e)
+
+    def _poll_batch(self, batch: Dict[str, Dict[str, Any]]):
+        """Check one batch of pending invoices and apply the results"""
+        now = datetime.now(timezone.utc)
         timeout = timedelta(seconds=Config.POLLING_TIMEOUT)
-        interval = Config.POLLING_INTERVAL
 
-        try:
-            while not stop_flag.is_set():
-                # Check for timeout
-                if datetime.now(timezone.utc) - start_time > timeout:
-                    logger.warning(f"Polling timeout for contribution {contribution_id}")
-                    self._update_contribution_status_by_id(contribution_id, "expired")
-                    break
-
-                try:
-                    # Check payment status with LNbits
-                    status_data = self.lnbits_service.check_invoice_status(payment_hash)
-
-                    if status_data["paid"]:
-                        # Payment confirmed!
-                        if self._already_paid(payment_hash):
-                            logger.info("Contribution already marked as paid, skipping")
-                            break
-
-                        # Update contribution status
-                        self._update_contribution_status_by_payment_hash(
-                            payment_hash=payment_hash,
-                            status="paid",
-                            paid_at=datetime.now(timezone.utc).isoformat(),
-                            preimage=status_data.get("preimage")
-                        )
-
-                        # Update campaign amount
-                        self._update_campaign_amount(contribution_id, campaign_id)
-
-                        # Execute callback if provided
-                        if callback:
-                            callback(contribution_id, status_data)
-
-                        logger.info(f"Payment confirmed for contribution {contribution_id}")
-                        break
-
-                    elif status_data.get("status") in ["expired", "cancelled", "failed"]:
-                        # Payment failed or expired
-                        self._update_contribution_status_by_id(
-                            contribution_id,
-                            status_data["status"]
-                        )
-                        logger.info(f"Payment {status_data['status']} for contribution {contribution_id}")
-                        break
-
-                except LNbitsAPIError as e:
-                    logger.error(f"LNbits polling error: {str(e)}")
-                    # Continue polling on API errors (might be temporary)
-
-                # Wait before next poll
-                stop_flag.wait(interval)
+        timed_out = [cid for cid, entry in batch.items() if now - entry['started_at'] > timeout]
+        for contribution_id in timed_out:
+            logger.warning("Polling timeout for contribution %s", contribution_id)
+            del batch[contribution_id]
+        self._finish(timed_out, "expired")
 
-        except Exception as e:
-            logger.error(f"Unexpected polling error: {str(e)}")
-            self._update_contribution_status_by_id(contribution_id, "failed")
-
-        finally:
-            # Cleanup
-            self.polling_threads.pop(contribution_id, None)
-            self.stop_flags.pop(contribution_id, None)
-
-    def _already_paid(self, payment_hash: str) -> bool:
-        """Check if contribution is already marked as paid"""
-        response = (
-            self.supabase.table("contributions")
-            .select("payment_status")
-            .eq("bitnob_payment_hash", payment_hash)  # Using legacy column name
-            .single()
-            .execute()
-        )
-        return response.data and response.data["payment_status"] == "paid"
-
-    def _update_contribution_status_by_payment_hash(
-        self,
-        payment_hash: str,
-        status: str,
-        paid_at: Optional[str] = None,
-        preimage: Optional[str] = None
-    ):
-        """Update contribution status by payment hash"""
-        update_data = {
-            "payment_status": status,
-            "updated_at": datetime.now(timezone.utc).isoformat()
+        # Issue all status checks concurrently instead of one after another
+        futures = {
+            contribution_id: self._executor.submit(
+                self.lnbits_service.check_invoice_status, entry['payment_hash']
+            )
+            for contribution_id, entry in batch.items()
         }
 
-        if paid_at:
-            update_data["paid_at"] = paid_at
-
-        if preimage:
-            update_data["transaction_id"] = preimage  # Store preimage as proof of payment
-
-        self.supabase.table("contributions") \
-            .update(update_data) \
-            .eq("bitnob_payment_hash", payment_hash) \
-            .execute()
-
-        logger.info(f"Contribution with payment_hash {payment_hash} marked as {status}")
-
-    def _update_contribution_status_by_id(self, contribution_id: str, status: str):
-        """Update contribution status by ID"""
-        self.supabase.table("contributions") \
-            .update({
-                "payment_status": status,
-                "updated_at": datetime.now(timezone.utc).isoformat()
-            }) \
-            .eq("id", contribution_id) \
-            .execute()
-
-        logger.info(f"Contribution {contribution_id} marked as {status}")
+        closed: Dict[str, List[str]] = {}
+        for contribution_id, future in futures.items():
+            entry = batch[contribution_id]
+            try:
+                status_data = future.result()
+            except LNbitsAPIError as e:
+                # Keep polling on API errors (might be temporary)
+                logger.error("LNbits polling error: %s", e)
+                continue
+            except Exception as e:
+                logger.error("Unexpected polling error: %s", e)
+                closed.setdefault("failed", []).append(contribution_id)
+                continue
+
+            if status_data["paid"]:
+                self._confirm_payment(contribution_id, entry, status_data)
+            elif status_data.get("status") in CLOSED_STATUSES:
+                logger.info("Payment %s for contribution %s", status_data['status'], contribution_id)
+                closed.setdefault(status_data["status"], []).append(contribution_id)
+
+        for status, contribution_ids in closed.items():
+            self._finish(contribution_ids, status)
+
+    def _confirm_payment(self, contribution_id: str, entry: Dict[str, Any], status_data: Dict[str, Any]):
+        """Mark a polled contribution as paid and credit its campaign"""
+        self.stop_polling(contribution_id)
 
-    def _update_campaign_amount(self, contribution_id: str, campaign_id: str):
-        """Update campaign's current_amount when contribution is paid"""
-        # Get contribution amount
-        contrib = (
-            self.supabase.table("contributions")
-            .select("amount")
-            .eq("id", contribution_id)
-            .single()
-            .execute()
-        )
+        try:
+            confirmed = mark_contribution_paid(
+                entry['payment_hash'], status_data.get("preimage")
+            )
+            if not confirmed:
+                logger.info("Contribution already marked as paid, skipping")
+                return
 
-        if not contrib.data:
-            logger.error(f"Contribution {contribution_id} not found")
-            return
+            # Execute callback if provided
+            if entry['callback']:
+                entry['callback'](contribution_id, status_data)
 
-        # Get current campaign amount
-        campaign = (
-            self.supabase.table("campaigns")
-            .select("current_amount")
-            .eq("id", campaign_id)
-            .single()
-            .execute()
-        )
+        except Exception as e:
+            logger.error("Unexpected polling error: %s", e)
+            self._update_contribution_status_by_ids([contribution_id], "failed")
 
-        if not campaign.data:
-            logger.error(f"Campaign {campaign_id} not found")
+    def _finish(self, contribution_ids: List[str], status: str):
+        """Stop polling the given contributions and record their final status"""
+        if not contribution_ids:
             return
+        for contribution_id in contribution_ids:
+            self.stop_polling(contribution_id)
+        try:
+            self._update_contribution_status_by_ids(contribution_ids, status)
+        except Exception as e:
+            logger.error("Failed to mark contributions as %s: %s", status, e)
 
-        # Calculate platform fee and creator amount
-        contribution_amount = contrib.data["amount"]
-        platform_fee_percent = Config.PLATFORM_FEE_PERCENT / 100
-        platform_fee = contribution_amount * platform_fee_percent
-        creator_amount = contribution_amount - platform_fee
-
-        # Update campaign with creator amount (after fee)
-        new_amount = campaign.data["current_amount"] + creator_amount
-
-        self.supabase.table("campaigns") \
+    def _update_contribution_status_by_ids(self, contribution_ids: List[str], status: str):
+        """
+        Update the status of several contributions in a single statement;
+        paid contributions are final and left alone
+        """
+        self.supabase.table("contributions") \
             .update({
-                "current_amount": new_amount,
+                "payment_status": status,
                 "updated_at": datetime.now(timezone.utc).isoformat()
             }) \
-            .eq("id", campaign_id) \
+            .in_("id", contribution_ids) \
+            .neq("payment_status", "paid") \
             .execute()
 
-        logger.info(
-            f"Campaign {campaign_id} amount updated to {new_amount} "
-            f"(+{creator_amount} sats after {platform_fee} sats fee)"
-        )
+        logger.info("Contributions %s marked as %s", ", ".join(contribution_ids), status)
 
     def get_active_polls(self) -> list:
         """Get list of contribution IDs currently being polled"""
-        return list(self.polling_threads.keys())
+        with self._lock:
+            return list(self.pending.keys())
 
     def stop_all_polling(self):
-        """Stop all active polling threads"""
-        for contribution_id in list(self.stop_flags.keys()):
+        """Stop polling every pending contribution"""
+        for contribution_id in self.get_active_polls():
             self.stop_polling(contribution_id)
 
-    def handle_webhook_payment(
-        self,
-        payment_hash: str,
-        campaign_id: Optional[str] = None
-    ) -> bool:
-        """
-        Handle payment confirmation from LNbits webhook
-
-        This is called when LNbits sends a webhook notification.
-        It updates the contribution and campaign, then stops any active polling.
-
-        Args:
-            payment_hash: The payment hash from the webhook
-            campaign_id: Optional campaign ID (looked up if not provided)
-
-        Returns:
-            True if payment was processed successfully
-        """
-        try:
-            # Find contribution by payment hash
-            response = (
-                self.supabase.table("contributions")
-                .select("id, campaign_id, amount, payment_status")
-                .eq("bitnob_payment_hash", payment_hash)
-                .single()
-                .execute()
-            )
-
-            if not response.data:
-                logger.warning(f"No contribution found for payment_hash: {payment_hash}")
-                return False
 
-            contribution = response.data
-            contribution_id = contribution["id"]
+def get_polling_service() -> InvoicePollingService:
+    """Get or create the process-wide polling service singleton"""
+    global _polling_service
 
-            # Check if already paid
-            if contribution["payment_status"] == "paid":
-                logger.info(f"Contribution {contribution_id} already paid")
-                return True
+    if _polling_service is None:
+        _polling_service = InvoicePollingService()
 
-            # Update contribution status
-            self._update_contribution_status_by_payment_hash(
-                payment_hash=payment_hash,
-                status="paid",
-                paid_at=datetime.now(timezone.utc).isoformat()
-            )
-
-            # Update campaign amount
-            self._update_campaign_amount(
-                contribution_id,
-                campaign_id or contribution["campaign_id"]
-            )
-
-            # Stop polling if active
-            self.stop_polling(contribution_id)
-
-            logger.info(f"Webhook payment processed for contribution {contribution_id}")
-            return True
-
-        except Exception as e:
-            logger.error(f"Error handling webhook payment: {str(e)}")
-            return False
+    return _polling_service
@@ -13,16 +13,39 @@ Lightning Payment Flow:
 API Reference: https://demo.lnbits.com/docs
 """
 
-import requests
+import httpx
+import json
 import logging
 import hmac
 import hashlib
-from typing import Dict, Any, Optional
+import time
+from decimal import Decimal
+from typing import Dict, Any, Iterator, Optional, Tuple
 from config import Config
 
 
 logger = logging.getLogger(__name__)
 
+# Default per-request timeouts; connection setup should be quick
+REQUEST_TIMEOUT = httpx.Timeout(30.0, connect=2.0)
+# Outgoing payments may wait on route finding
+PAYMENT_TIMEOUT = httpx.Timeout(60.0, connect=2.0)
+
+# Read-only calls are retried on these gateway errors, backing off from
+# GET_RETRY_BACKOFF seconds; invoice creation and payments never are
+GET_RETRY_STATUSES = frozenset((502, 503, 504))
+GET_RETRIES = 2
+GET_RETRY_BACKOFF = 0.2
+
+# Webhook signatures are hex HMAC-SHA256 digests
+WEBHOOK_SIGNATURE_LENGTH = 64
+
+# LNbits sends keep-alive pings on the event stream; treat a longer
+# silence as a dead connection
+SSE_READ_TIMEOUT = 90
+
+_lnbits_service: Optional['LNbitsService'] = None
+
 
 class LNbitsAPIError(Exception):
     """Custom exception for LNbits API errors"""
@@ -47,13 +70,34 @@ class LNbitsService:
         self.invoice_key = Config.LNBITS_INVOICE_KEY
         self.wallet_id = Config.LNBITS_WALLET_ID
         self.webhook_url = Config.LNBITS_WEBHOOK_URL
+        # Webhook HMAC key, encoded once rather than per delivery
+        self._webhook_key = (self.admin_key or '').encode('utf-8')
+
+        # One pooled HTTP/2 client: status checks and invoice creation share
+        # a kept-alive connection instead of reconnecting per call. The
+        # transport retries failed connection attempts; _get also retries
+        # gateway errors on reads.
+        self.session = httpx.Client(
+            transport=httpx.HTTPTransport(
+                http2=True,
+                retries=2,
+                limits=httpx.Limits(max_keepalive_connections=64)
+            ),
+            timeout=REQUEST_TIMEOUT,
+            headers={
+                'Content-Type': 'application/json',
+                'Accept': 'application/json'
+            }
+        )
 
-        self.session = requests.Session()
-        # Default headers use invoice key (safer for most operations)
-        self.session.headers.update({
-            'Content-Type': 'application/json',
-            'Accept': 'application/json'
-        })
+    def _get(self, url: str, **kwargs) -> httpx.Response:
+        """GET with retries on transient gateway errors (safe: reads only)"""
+        for attempt in range(GET_RETRIES + 1):
+            response = self.session.get(url, **kwargs)
+            if response.status_code not in GET_RETRY_STATUSES or attempt == GET_RETRIES:
+                return response
+            logger.warning("LNbits returned %s, retrying GET %s", response.status_code, url)
+            time.sleep(GET_RETRY_BACKOFF * 2 ** attempt)
 
     def _get_headers(self, use_admin_key: bool = False) -> Dict[str, str]:
         """
@@ -89,10 +133,9 @@ class LNbitsService:
         try:
             logger.info("Fetching LNbits wallet details")
 
-            response = self.session.get(
+            response = self._get(
                 f'{self.api_url}/api/v1/wallet',
-                headers=self._get_headers(use_admin_key=False),
-                timeout=30
+                headers=self._get_headers(use_admin_key=False)
             )
 
             response.raise_for_status()
@@ -102,7 +145,7 @@ class LNbitsService:
             balance_msats = data.get('balance', 0)
             balance_sats = balance_msats / 1000
 
-            logger.info(f"Wallet balance: {balance_sats} sats")
+            logger.info("Wallet balance: %s sats", balance_sats)
 
             return {
                 'id': data.get('id'),
@@ -112,13 +155,13 @@ class LNbitsService:
                 'balance_btc': balance_sats / 100_000_000
             }
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"LNbits API request failed: {str(e)}")
+        except httpx.HTTPError as e:
+            logger.error("LNbits API request failed: %s", e)
             if hasattr(e, 'response') and e.response is not None:
-                logger.error(f"Response: {e.response.text}")
+                logger.error("Response: %s", e.response.text)
             raise LNbitsAPIError(f"Failed to get wallet details: {str(e)}")
         except Exception as e:
-            logger.error(f"Unexpected error getting wallet details: {str(e)}")
+            logger.error("Unexpected error getting wallet details: %s", e)
             raise LNbitsAPIError(f"Unexpected error: {str(e)}")
 
     def create_invoice(
@@ -166,13 +209,12 @@ class LNbitsService:
             if webhook_url:
                 payload['webhook'] = webhook_url
 
-            logger.info(f"Creating LNbits invoice for {amount} sats")
+            logger.info("Creating LNbits invoice for %s sats", amount)
 
             response = self.session.post(
                 f'{self.api_url}/api/v1/payments',
                 headers=self._get_headers(use_admin_key=False),
-                json=payload,
-                timeout=30
+                json=payload
             )
 
             response.raise_for_status()
@@ -184,7 +226,7 @@ class LNbitsService:
             if not payment_hash or not payment_request:
                 raise LNbitsAPIError("Invalid response: missing payment_hash or payment_request")
 
-            logger.info(f"Invoice created with payment_hash: {payment_hash}")
+            logger.info("Invoice created with payment_hash: %s", payment_hash)
 
             return {
                 'payment_hash': payment_hash,
@@ -196,13 +238,13 @@ class LNbitsService:
                 'status': 'pending'
             }
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"LNbits API request failed: {str(e)}")
+        except httpx.HTTPError as e:
+            logger.error("LNbits API request failed: %s", e)
             if hasattr(e, 'response') and e.response is not None:
-                logger.error(f"Response: {e.response.text}")
+                logger.error("Response: %s", e.response.text)
             raise LNbitsAPIError(f"Failed to create invoice: {str(e)}")
         except Exception as e:
-            logger.error(f"Unexpected error creating invoice: {str(e)}")
+            logger.error("Unexpected error creating invoice: %s", e)
             raise LNbitsAPIError(f"Unexpected error: {str(e)}")
 
     def check_invoice_status(self, payment_hash: str) -> Dict[str, Any]:
@@ -228,12 +270,11 @@ class LNbitsService:
             LNbitsAPIError: If status check fails
         """
         try:
-            logger.info(f"Checking payment status for: {payment_hash}")
+            logger.info("Checking payment status for: %s", payment_hash)
 
-            response = self.session.get(
+            response = self._get(
                 f'{self.api_url}/api/v1/payments/{payment_hash}',
-                headers=self._get_headers(use_admin_key=False),
-                timeout=30
+                headers=self._get_headers(use_admin_key=False)
             )
 
             response.raise_for_status()
@@ -251,7 +292,7 @@ class LNbitsService:
                 # Check if expired based on expiry field
                 status = 'expired' if data.get('expired') else 'pending'
 
-            logger.info(f"Payment {payment_hash} status: {status}")
+            logger.info("Payment %s status: %s", payment_hash, status)
 
             return {
                 'payment_hash': payment_hash,
@@ -265,13 +306,13 @@ class LNbitsService:
                 'pending': data.get('pending', not is_paid)
             }
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to check payment status: {str(e)}")
+        except httpx.HTTPError as e:
+            logger.error("Failed to check payment status: %s", e)
             if hasattr(e, 'response') and e.response is not None:
-                logger.error(f"Response: {e.response.text}")
+                logger.error("Response: %s", e.response.text)
             raise LNbitsAPIError(f"Failed to check payment status: {str(e)}")
         except Exception as e:
-            logger.error(f"Unexpected error checking status: {str(e)}")
+            logger.error("Unexpected error checking status: %s", e)
             raise LNbitsAPIError(f"Unexpected error: {str(e)}")
 
     def decode_invoice(self, bolt11: str) -> Dict[str, Any]:
@@ -301,8 +342,7 @@ class LNbitsService:
             response = self.session.post(
                 f'{self.api_url}/api/v1/payments/decode',
                 headers=self._get_headers(use_admin_key=False),
-                json={'data': bolt11},
-                timeout=30
+                json={'data': bolt11}
             )
 
             response.raise_for_status()
@@ -319,13 +359,13 @@ class LNbitsService:
                 'date': data.get('date')
             }
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to decode invoice: {str(e)}")
+        except httpx.HTTPError as e:
+            logger.error("Failed to decode invoice: %s", e)
             if hasattr(e, 'response') and e.response is not None:
-                logger.error(f"Response: {e.response.text}")
+                logger.error("Response: %s", e.response.text)
             raise LNbitsAPIError(f"Failed to decode invoice: {str(e)}")
         except Exception as e:
-            logger.error(f"Unexpected error decoding invoice: {str(e)}")
+            logger.error("Unexpected error decoding invoice: %s", e)
             raise LNbitsAPIError(f"Unexpected error: {str(e)}")
 
     def pay_invoice(self, bolt11: str) -> Dict[str, Any]:
@@ -363,14 +403,14 @@ class LNbitsService:
                 f'{self.api_url}/api/v1/payments',
                 headers=self._get_headers(use_admin_key=True),  # ADMIN KEY required
                 json=payload,
-                timeout=60  # Longer timeout for payments
+                timeout=PAYMENT_TIMEOUT
             )
 
             response.raise_for_status()
             data = response.json()
 
             payment_hash = data.get('payment_hash')
-            logger.info(f"Payment sent with hash: {payment_hash}")
+            logger.info("Payment sent with hash: %s", payment_hash)
 
             return {
                 'payment_hash': payment_hash,
@@ -379,16 +419,16 @@ class LNbitsService:
                 'status': 'complete'
             }
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to pay invoice: {str(e)}")
+        except httpx.HTTPError as e:
+            logger.error("Failed to pay invoice: %s", e)
             if hasattr(e, 'response') and e.response is not None:
-                logger.error(f"Response: {e.response.text}")
+                logger.error("Response: %s", e.response.text)
             raise LNbitsAPIError(f"Failed to pay invoice: {str(e)}")
         except Exception as e:
-            logger.error(f"Unexpected error paying invoice: {str(e)}")
+            logger.error("Unexpected error paying invoice: %s", e)
             raise LNbitsAPIError(f"Unexpected error: {str(e)}")
 
-    def verify_webhook_signature(self, payload: str, signature: str) -> bool:
+    def verify_webhook_signature(self, payload: bytes, signature: str) -> bool:
         """
         Verify webhook signature from LNbits
 
@@ -396,8 +436,9 @@ class LNbitsService:
         This implementation uses HMAC-SHA256 with the admin key as secret.
 
         Args:
-            payload: Raw webhook payload
-            signature: Signature from webhook headers
+            payload: Raw webhook body (bytes, as received)
+            signature: Hex signature from webhook headers, optionally
+                       prefixed with "sha256="
 
         Returns:
             True if signature is valid, False otherwise
@@ -406,18 +447,28 @@ class LNbitsService:
             logger.warning("No webhook signature provided")
             return False
 
+        signature = signature.removeprefix('sha256=')
+
+        # Anything but a 64-character hex digest can't match; skip the HMAC
+        # for garbage headers
+        if len(signature) != WEBHOOK_SIGNATURE_LENGTH:
+            return False
+
         try:
             # LNbits uses the admin key for webhook signatures
             expected_signature = hmac.new(
-                self.admin_key.encode('utf-8'),
-                payload.encode('utf-8'),
+                self._webhook_key,
+                payload,
                 hashlib.sha256
-            ).hexdigest()
+            ).digest()
 
-            return hmac.compare_digest(expected_signature, signature)
+            return hmac.compare_digest(expected_signature, bytes.fromhex(signature))
 
+        except ValueError:
+            # Not hex
+            return False
         except Exception as e:
-            logger.error(f"Error verifying webhook signature: {str(e)}")
+            logger.error("Error verifying webhook signature: %s", e)
             return False
 
     def get_payments(self, limit: int = 20) -> Dict[str, Any]:
@@ -437,13 +488,12 @@ class LNbitsService:
             LNbitsAPIError: If API call fails
         """
         try:
-            logger.info(f"Fetching last {limit} payments")
+            logger.info("Fetching last %s payments", limit)
 
-            response = self.session.get(
+            response = self._get(
                 f'{self.api_url}/api/v1/payments',
                 headers=self._get_headers(use_admin_key=False),
-                params={'limit': limit},
-                timeout=30
+                params={'limit': limit}
             )
 
             response.raise_for_status()
@@ -454,20 +504,93 @@ class LNbitsService:
                 'count': len(data) if isinstance(data, list) else 0
             }
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to get payments: {str(e)}")
+        except httpx.HTTPError as e:
+            logger.error("Failed to get payments: %s", e)
             if hasattr(e, 'response') and e.response is not None:
-                logger.error(f"Response: {e.response.text}")
+                logger.error("Response: %s", e.response.text)
             raise LNbitsAPIError(f"Failed to get payments: {str(e)}")
         except Exception as e:
-            logger.error(f"Unexpected error getting payments: {str(e)}")
+            logger.error("Unexpected error getting payments: %s", e)
             raise LNbitsAPIError(f"Unexpected error: {str(e)}")
 
+    def stream_payment_events(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Stream wallet payment events (Server-Sent Events)
+
+        Endpoint: GET /api/v1/payments/sse
+        Header: X-Api-Key = invoice/read key
+
+        One long-lived connection delivers every payment on the wallet as it
+        happens, instead of checking each invoice separately. The generator
+        ends when LNbits closes the stream.
+
+        Yields:
+            (event, payment) tuples, e.g. ('payment-received', {...})
+
+        Raises:
+            LNbitsAPIError: If the stream cannot be opened or breaks
+        """
+        headers = self._get_headers(use_admin_key=False)
+        headers['Accept'] = 'text/event-stream'
+
+        try:
+            logger.info("Opening LNbits payment event stream")
+
+            with self.session.stream(
+                'GET',
+                f'{self.api_url}/api/v1/payments/sse',
+                headers=headers,
+                timeout=httpx.Timeout(10.0, read=SSE_READ_TIMEOUT)
+            ) as response:
+                response.raise_for_status()
+
+                event, data_lines = 'message', []
+                for line in response.iter_lines():
+                    if line:
+                        field, _, value = line.partition(':')
+                        if field == 'event':
+                            event = value.strip()
+                        elif field == 'data':
+                            data_lines.append(value.lstrip())
+                        continue
+
+                    # A blank line ends the event
+                    if data_lines:
+                        try:
+                            yield event, json.loads('\n'.join(data_lines))
+                        except ValueError:
+                            logger.warning("Skipping malformed LNbits event: %s", data_lines)
+                    event, data_lines = 'message', []
+
+        except httpx.HTTPError as e:
+            logger.error("LNbits payment event stream failed: %s", e)
+            raise LNbitsAPIError(f"Payment event stream failed: {str(e)}")
+
+
+def get_lnbits_service() -> LNbitsService:
+    """
+    Get or create the process-wide LNbits service
+
+    Routes and the polling service share it, and with it one pool of
+    kept-alive connections to LNbits.
+    """
+    global _lnbits_service
+
+    if _lnbits_service is None:
+        _lnbits_service = LNbitsService()
+
+    return _lnbits_service
+
 
 # Utility functions for satoshi conversions
-def btc_to_sats(btc: float) -> int:
-    """Convert BTC to satoshis"""
-    return int(btc * 100_000_000)
+def btc_to_sats(btc) -> int:
+    """
+    Convert BTC to satoshis (truncating sub-satoshi amounts)
+
+    Goes through Decimal(str(btc)) so amounts like 0.00000003 BTC convert
+    exactly instead of picking up binary float error.
+    """
+    return int(Decimal(str(btc)) * 100_000_000)
 
 
 def sats_to_btc(sats: int) -> float:
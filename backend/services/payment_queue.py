@@ -0,0 +1,155 @@
+"""
+Payment Confirmation Queue
+
+Webhook and event-stream payment notifications are queued here instead of
+being written one by one: every CONFIRMATION_BATCH_INTERVAL seconds up to
+CONFIRMATION_BATCH_SIZE queued payments are confirmed with a single
+mark_contributions_paid RPC, which also credits each campaign with the sum
+of its newly paid contributions in the same statement.
+
+With Redis configured every queued payment is also recorded in a shared
+hash until it is confirmed, so a notification acknowledged by a worker that
+dies before flushing is picked up by any other worker once it is older than
+RECOVERY_AGE. Without Redis, such a notification is still caught by
+GET /api/contributions/<id>/status, which asks LNbits directly once an
+invoice has been pending longer than LNBITS_STREAM_SLA.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+import orjson
+import redis
+
+from .cache import get_redis_client
+from .payments import mark_contributions_paid
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Redis hash of payment_hash -> {preimage, queued_at} awaiting confirmation
+PENDING_KEY = 'payments:confirming:v1'
+# Entries older than this (seconds) are treated as orphaned and re-queued
+RECOVERY_AGE = 30
+
+_payment_queue: Optional['PaymentConfirmationQueue'] = None
+
+
+class PaymentConfirmationQueue:
+    """Collects paid invoices and confirms them in batches"""
+
+    def __init__(self, interval: float, batch_size: int):
+        self.interval = interval
+        self.batch_size = batch_size
+        # payment_hash -> preimage; repeated reports of a payment collapse
+        self._pending: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._last_recovery = time.monotonic()
+
+    def put(self, payment_hash: str, preimage: Optional[str] = None):
+        """Queue a paid invoice for the next flush"""
+        self._persist(payment_hash, preimage)
+        with self._lock:
+            self._pending[payment_hash] = preimage or self._pending.get(payment_hash)
+        self.start()
+
+    def start(self):
+        """Start the background flusher (no-op if already running)"""
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._worker = threading.Thread(
+                target=self._run, name='payment-queue', daemon=True
+            )
+            self._worker.start()
+
+    def _run(self):
+        """Flush queued payments every interval"""
+        while True:
+            time.sleep(self.interval)
+            if time.monotonic() - self._last_recovery > RECOVERY_AGE:
+                self._last_recovery = time.monotonic()
+                self.recover()
+            self.flush()
+
+    def _persist(self, payment_hash: str, preimage: Optional[str]):
+        """Record a queued payment in Redis until it is confirmed"""
+        client = get_redis_client()
+        if client is None:
+            return
+        try:
+            client.hset(PENDING_KEY, payment_hash, orjson.dumps({
+                'preimage': preimage, 'queued_at': time.time()
+            }))
+        except redis.RedisError as e:
+            logger.warning("Redis write failed for queued payment %s: %s", payment_hash, e)
+
+    def _forget(self, payment_hashes: Iterable[str]):
+        """Drop confirmed payments from the Redis record"""
+        client = get_redis_client()
+        if client is None:
+            return
+        try:
+            client.hdel(PENDING_KEY, *payment_hashes)
+        except redis.RedisError as e:
+            logger.warning("Redis delete failed for queued payments: %s", e)
+
+    def recover(self):
+        """Re-queue payments another worker acknowledged but never confirmed"""
+        client = get_redis_client()
+        if client is None:
+            return
+        try:
+            recorded = client.hgetall(PENDING_KEY)
+        except redis.RedisError as e:
+            logger.warning("Redis read failed for queued payments: %s", e)
+            return
+
+        cutoff = time.time() - RECOVERY_AGE
+        recovered = 0
+        with self._lock:
+            for payment_hash, value in recorded.items():
+                entry = orjson.loads(value)
+                payment_hash = payment_hash.decode()
+                if entry['queued_at'] < cutoff and payment_hash not in self._pending:
+                    self._pending[payment_hash] = entry['preimage']
+                    recovered += 1
+        if recovered:
+            logger.warning("Re-queued %s orphaned payment confirmations", recovered)
+
+    def flush(self):
+        """Confirm queued payments, batch_size per RPC"""
+        while True:
+            with self._lock:
+                if not self._pending:
+                    return
+                hashes = list(self._pending)[:self.batch_size]
+                batch = {payment_hash: self._pending.pop(payment_hash) for payment_hash in hashes}
+
+            try:
+                confirmed = mark_contributions_paid(batch)
+                logger.info("Confirmed %s of %s queued payments", confirmed, len(batch))
+                self._forget(batch)
+            except Exception as e:
+                logger.error("Error confirming queued payments: %s", e)
+                with self._lock:
+                    for payment_hash, preimage in batch.items():
+                        self._pending.setdefault(payment_hash, preimage)
+                return
+
+
+def get_payment_queue() -> PaymentConfirmationQueue:
+    """Get or create the process-wide payment confirmation queue"""
+    global _payment_queue
+
+    if _payment_queue is None:
+        _payment_queue = PaymentConfirmationQueue(
+            Config.CONFIRMATION_BATCH_INTERVAL, Config.CONFIRMATION_BATCH_SIZE
+        )
+        atexit.register(_payment_queue.flush)
+
+    return _payment_queue
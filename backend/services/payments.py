@@ -0,0 +1,88 @@
+"""
+Payment confirmation shared by every path that learns an invoice was paid
+
+The LNbits webhook, the contribution status check and the payment event
+subscriber all finish a payment the same way: mark the contribution paid,
+credit the campaign (less the platform fee) and stop any polling. Marking
+paid and crediting happen in one mark_contributions_paid statement, so a
+crash can't leave a contribution paid but uncredited.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from .campaign_cache import invalidate_campaign
+from .supabase_client import get_supabase_client
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def mark_contribution_paid(
+    payment_hash: str,
+    preimage: Optional[str] = None
+) -> Optional[bool]:
+    """
+    Mark the contribution for payment_hash as paid and credit its campaign
+
+    Safe to call more than once for the same payment (webhook, event stream
+    and status checks may all report it): the update only matches a
+    contribution that is not paid yet, and the campaign is credited in the
+    same statement only when that update changed a row.
+
+    Returns:
+        True if this call confirmed the payment, False if it was already
+        paid, or None if no contribution has this payment hash
+    """
+    if mark_contributions_paid({payment_hash: preimage}):
+        return True
+
+    # Nothing changed: tell "already paid" apart from "unknown hash"
+    existing = get_supabase_client().table('contributions').select(
+        'id', count='exact', head=True
+    ).eq('bitnob_payment_hash', payment_hash).execute()
+    if not existing.count:
+        logger.warning("No contribution found for payment_hash: %s", payment_hash)
+        return None
+    return False
+
+
+def mark_contributions_paid(payments: Dict[str, Optional[str]]) -> int:
+    """
+    Batch form of mark_contribution_paid for many payments at once
+
+    One mark_contributions_paid RPC updates every listed contribution that is
+    not paid yet and, in the same statement, credits each campaign with the
+    sum of its newly paid contributions less the platform fee, so repeated
+    or concurrent reports stay idempotent and "paid" never runs ahead of
+    "credited".
+
+    Args:
+        payments: payment_hash -> preimage (or None)
+
+    Returns:
+        Number of contributions this call confirmed
+    """
+    response = get_supabase_client().rpc('mark_contributions_paid', {
+        'payments': [
+            {'payment_hash': payment_hash, 'preimage': preimage}
+            for payment_hash, preimage in payments.items()
+        ],
+        'fee_bp': Config.PLATFORM_FEE_BP
+    }).execute()
+
+    confirmed = response.data or []
+    for campaign_id in {contribution['campaign_id'] for contribution in confirmed}:
+        invalidate_campaign(campaign_id)
+    _stop_polling(confirmed)
+    return len(confirmed)
+
+
+def _stop_polling(contributions: List[Dict[str, Any]]):
+    """Stop polling for newly paid contributions"""
+    # Imported here: the polling service itself confirms payments via this module
+    from .invoice_polling import get_polling_service
+
+    for contribution in contributions:
+        get_polling_service().stop_polling(contribution['id'])
+        logger.info("Payment confirmed for contribution %s", contribution['id'])
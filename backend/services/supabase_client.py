@@ -1,26 +1,39 @@
-from supabase import create_client, Client
+import httpx
+from functools import lru_cache
+from supabase import create_client, Client, ClientOptions
 from config import Config
-from typing import Optional
 
-_supabase_client: Optional[Client] = None
 
+def _create_http_client() -> httpx.Client:
+    """Create the pooled HTTP client shared by PostgREST and Auth calls"""
+    return httpx.Client(
+        http2=True,
+        timeout=httpx.Timeout(10.0, connect=5.0),
+        limits=httpx.Limits(
+            max_keepalive_connections=20,
+            max_connections=100,
+            keepalive_expiry=30
+        ),
+        follow_redirects=True
+    )
 
+
+@lru_cache(maxsize=None)
 def get_supabase_client() -> Client:
     """Get or create Supabase client singleton"""
-    global _supabase_client
-    
-    if _supabase_client is None:
-        if not Config.SUPABASE_URL or not Config.SUPABASE_KEY:
-            raise ValueError("Supabase configuration is missing")
-        
-        _supabase_client = create_client(
-            Config.SUPABASE_URL,
-            Config.SUPABASE_KEY
-        )
-    
-    return _supabase_client
+    if not Config.SUPABASE_URL or not Config.SUPABASE_KEY:
+        raise ValueError("Supabase configuration is missing")
+
+    # Keep-alive connections are reused across requests, so only the
+    # first call to the Supabase host pays for DNS + TLS setup
+    return create_client(
+        Config.SUPABASE_URL,
+        Config.SUPABASE_KEY,
+        options=ClientOptions(httpx_client=_create_http_client())
+    )
 
 def reset_supabase_client():
     """Reset the Supabase client (useful for testing)"""
-    global _supabase_client
-    _supabase_client = None
+    if get_supabase_client.cache_info().currsize:
+        get_supabase_client().options.httpx_client.close()
+    get_supabase_client.cache_clear()
@@ -60,10 +60,16 @@ CREATE INDEX IF NOT EXISTS idx_contributions_payment_status ON contributions(pay
 CREATE INDEX IF NOT EXISTS idx_contributions_lnbits_payment_hash ON contributions(lnbits_payment_hash);
 CREATE INDEX IF NOT EXISTS idx_contributions_lnbits_checking_id ON contributions(lnbits_checking_id);
 CREATE INDEX IF NOT EXISTS idx_contributions_created_at ON contributions(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_contributions_campaign_created ON contributions(campaign_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_contributions_campaign_status_created ON contributions(campaign_id, payment_status, created_at DESC, id DESC);
 
 -- Legacy indexes (for backward compatibility during migration)
 CREATE INDEX IF NOT EXISTS idx_contributions_bitnob_payment_id ON contributions(bitnob_payment_id);
 CREATE INDEX IF NOT EXISTS idx_contributions_bitnob_reference ON contributions(bitnob_reference);
+CREATE INDEX IF NOT EXISTS idx_contributions_bitnob_payment_hash ON contributions(bitnob_payment_hash);
+
+-- Pending invoices awaiting confirmation
+CREATE INDEX IF NOT EXISTS idx_contributions_pending ON contributions(payment_status) WHERE payment_status = 'pending';
 
 -- Function to update updated_at timestamp
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -98,6 +104,133 @@ CREATE TRIGGER update_campaign_status_on_goal
     WHEN (OLD.current_amount < NEW.current_amount)
     EXECUTE FUNCTION check_campaign_goal();
 
+-- Contributions with anonymous contributor details redacted
+CREATE OR REPLACE VIEW contributions_public
+WITH (security_invoker = true) AS
+SELECT
+    id,
+    campaign_id,
+    CASE WHEN is_anonymous THEN 'Anonymous' ELSE contributor_name END AS contributor_name,
+    CASE WHEN is_anonymous THEN NULL ELSE contributor_email END AS contributor_email,
+    amount,
+    currency,
+    payment_status,
+    lnbits_payment_hash,
+    lnbits_payment_request,
+    lnbits_checking_id,
+    bitnob_payment_id,
+    bitnob_payment_request,
+    bitnob_payment_hash,
+    bitnob_reference,
+    transaction_id,
+    message,
+    is_anonymous,
+    created_at,
+    paid_at
+FROM contributions;
+
+GRANT SELECT ON contributions_public TO authenticated, anon;
+
+-- Campaigns with their contribution counts, for listings
+CREATE OR REPLACE VIEW campaigns_with_stats
+WITH (security_invoker = true) AS
+SELECT
+    c.*,
+    COALESCE(ct.total, 0)::INT AS total_contributions,
+    COALESCE(ct.paid, 0)::INT AS paid_contributions,
+    LEFT(c.description, 200) AS description_preview
+FROM campaigns c
+LEFT JOIN (
+    SELECT
+        campaign_id,
+        COUNT(*) AS total,
+        COUNT(*) FILTER (WHERE payment_status = 'paid') AS paid
+    FROM contributions
+    GROUP BY campaign_id
+) ct ON ct.campaign_id = c.id;
+
+GRANT SELECT ON campaigns_with_stats TO authenticated, anon;
+
+-- Function to mark the contributions for a batch of paid invoices as paid
+-- and credit their campaigns (less fee_bp basis points) in one statement
+CREATE OR REPLACE FUNCTION mark_contributions_paid(payments JSONB, fee_bp INT)
+RETURNS TABLE(id UUID, campaign_id UUID, amount NUMERIC) AS $$
+    WITH paid AS (
+        UPDATE contributions AS c
+        SET payment_status = 'paid',
+            paid_at = NOW(),
+            transaction_id = COALESCE(p.preimage, c.transaction_id)
+        FROM jsonb_to_recordset(payments) AS p(payment_hash TEXT, preimage TEXT)
+        WHERE c.bitnob_payment_hash = p.payment_hash
+          AND c.payment_status <> 'paid'
+        RETURNING c.id, c.campaign_id, c.amount
+    ), credited AS (
+        UPDATE campaigns AS cp
+        SET current_amount = cp.current_amount + s.total,
+            updated_at = NOW()
+        FROM (
+            SELECT paid.campaign_id,
+                   SUM(paid.amount - FLOOR(paid.amount * fee_bp / 10000)) AS total
+            FROM paid
+            GROUP BY paid.campaign_id
+        ) AS s
+        WHERE cp.id = s.campaign_id
+    )
+    SELECT paid.id, paid.campaign_id, paid.amount FROM paid;
+$$ LANGUAGE sql;
+
+-- Function to insert a contribution only while its campaign is active
+-- (P0002: campaign not found, P0001: campaign not active)
+CREATE OR REPLACE FUNCTION create_contribution_checked(cid UUID, payload JSONB)
+RETURNS VOID AS $$
+DECLARE
+    campaign_status TEXT;
+BEGIN
+    -- No row lock: FOR SHARE needs UPDATE rights on campaigns, which
+    -- contributors (anon) don't have under RLS
+    SELECT status INTO campaign_status FROM campaigns WHERE id = cid;
+
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Campaign not found' USING ERRCODE = 'P0002';
+    END IF;
+
+    IF campaign_status <> 'active' THEN
+        RAISE EXCEPTION 'Campaign is not active' USING ERRCODE = 'P0001';
+    END IF;
+
+    INSERT INTO contributions (
+        id, campaign_id, contributor_name, contributor_email, amount, currency,
+        payment_status, lnbits_payment_hash, lnbits_payment_request,
+        lnbits_checking_id, bitnob_payment_id, bitnob_payment_request,
+        bitnob_payment_hash, bitnob_reference, transaction_id, message,
+        is_anonymous, created_at
+    )
+    SELECT
+        COALESCE(r.id, uuid_generate_v4()), cid, r.contributor_name,
+        r.contributor_email, r.amount, COALESCE(r.currency, 'SATS'),
+        COALESCE(r.payment_status, 'pending'), r.lnbits_payment_hash,
+        r.lnbits_payment_request, r.lnbits_checking_id, r.bitnob_payment_id,
+        r.bitnob_payment_request, r.bitnob_payment_hash, r.bitnob_reference,
+        r.transaction_id, r.message, COALESCE(r.is_anonymous, FALSE),
+        COALESCE(r.created_at, NOW())
+    FROM jsonb_populate_record(NULL::contributions, payload) AS r;
+END;
+$$ LANGUAGE plpgsql;
+
+GRANT EXECUTE ON FUNCTION create_contribution_checked(UUID, JSONB) TO authenticated, anon;
+
+-- Function to count a campaign's contributions (total and paid)
+CREATE OR REPLACE FUNCTION campaign_contribution_stats(cid UUID)
+RETURNS TABLE(total INT, paid INT) AS $$
+    SELECT
+        COUNT(*)::INT,
+        (COUNT(*) FILTER (WHERE payment_status = 'paid'))::INT
+    FROM contributions
+    WHERE campaign_id = cid;
+$$ LANGUAGE sql STABLE;
+
+GRANT EXECUTE ON FUNCTION campaign_contribution_stats(UUID) TO authenticated, anon;
+
 -- Comments for documentation
 COMMENT ON TABLE campaigns IS 'Stores fundraising campaign information';
 COMMENT ON TABLE contributions IS 'Stores individual contributions to campaigns via Lightning Network';